@@ -10,10 +10,52 @@ class Config:
     # Speech recognition settings
     SPEECH_RECOGNITION_TIMEOUT = 5
     SPEECH_RECOGNITION_PHRASE_TIMEOUT = 0.3
+    SPEECH_CONTINUOUS_CAPTURE = True  # Keep one microphone stream open and buffer audio between listens
+    AUDIO_BUFFER_SECONDS = 10  # Ring buffer length for continuous capture
+    CALIBRATION_FILE = DATA_DIR / "mic_calibration.json"  # Last ambient-noise calibration
+    CALIBRATION_MAX_AGE = 7 * 24 * 3600  # Seconds before a saved calibration is ignored
+    CALIBRATION_SECONDS = 2  # Length of ambient-noise sampling
+    SPEECH_LOCALES = ['en-US', 'en-IN']  # Recognized in parallel
+    SPEECH_RECOGNITION_DEADLINE = 3.0  # Seconds to wait for locale results
+    SPEECH_MIN_CONFIDENCE = 0.8  # First result at or above this wins immediately
+    
+    # Voice activity detection
+    VAD_ENABLED = True
+    VAD_END_SILENCE = 0.4  # Seconds of non-speech that end a phrase
+    VAD_PADDING = 0.2  # Seconds of audio kept around detected speech
+    VAD_MIN_SPEECH = 0.15  # Clips with less speech than this are dropped
+    VAD_ENERGY_RATIO = 2.0  # Speech energy must exceed the noise floor by this factor
+    VAD_FLATNESS_MAX = 0.45  # Spectral flatness above this looks like noise
+    
+    # Recognition engines: "google" (cloud), "sphinx" or "vosk" (offline)
+    SPEECH_COMMAND_BACKEND = os.getenv('JARVIS_COMMAND_BACKEND', 'google')
+    SPEECH_WAKE_BACKEND = os.getenv('JARVIS_WAKE_BACKEND', 'google')  # "sphinx"/"vosk" keeps the wake loop local
+    WAKE_KEYWORDS = ["jarvis"]  # Keyword-spotting list for the Sphinx wake backend
+    WAKE_KEYWORD_SENSITIVITY = 0.85  # Sphinx keyword sensitivity, 0-1 (0.85 is a ~1e-25 threshold)
+    VOSK_MODEL_PATH = BASE_DIR / "models" / "vosk-model-small-en-us"
+    
+    # Wake words, including common mishears
+    WAKE_WORDS = [
+        "jarvis", "hey jarvis", "ok jarvis", "hello jarvis",
+        "java", "hey java", "ok java",      # Common mishears
+        "jervis", "jarrius", "jarvus"       # Phonetic variations
+    ]
+    WAKE_WORD_MIN_CONFIDENCE = 60  # Phonetic matches below this are not treated as wake words
+    
+    # Local wake-word spotter (energy gate + MFCC/DTW against recorded templates)
+    WAKE_SPOTTER_ENABLED = True
+    WAKE_TEMPLATES_DIR = DATA_DIR / "wake_templates"  # 16 kHz mono WAV recordings of "jarvis"
+    WAKE_SPOTTER_THRESHOLD = 0.3  # Max average DTW cosine distance that still counts as a match
+    WAKE_SPOTTER_STATS_EVERY = 100  # Log how many clips skipped recognition every this many checks
     
     # Text-to-speech settings
     TTS_RATE = 180
     TTS_VOLUME = 0.9
+    TTS_ECHO_WINDOW = 4.0  # Seconds our last utterance still counts as echo (covers VAD end-point + recognition)
+    TTS_CHUNK_CHARS = 50  # Long responses are spoken sentence/clause by sentence, up to this length
+    TTS_CACHE_ENABLED = True  # Pre-render fixed phrases and play them back from disk
+    TTS_CACHE_DIR = DATA_DIR / "tts_cache"
+    TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024
     
     # OpenAI settings (optional)
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
@@ -27,9 +69,40 @@ class Config:
     # Logging
     LOG_LEVEL = "INFO"
     LOG_FILE = LOGS_DIR / "jarvis.log"
+    LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate jarvis.log at this size
+    LOG_BACKUP_COUNT = 3  # Rotated log files kept
+    LOG_JSON = False  # Write the log file as JSON lines instead of plain text
+    
+    # Command registry settings
+    COMMANDS_RELOAD_INTERVAL = 1.0  # Seconds between commands.json mtime checks
+    INTENT_CACHE_SIZE = 256  # Normalized utterances kept in the intent LRU cache
+    
+    # System metrics sampler
+    METRICS_SAMPLE_INTERVAL = 1.0  # Seconds between background CPU/memory/disk samples
+    
+    # GUI status push
+    GUI_STATUS_PUSH_INTERVAL = 1.0  # Seconds between server-side status checks
+    GUI_STATUS_DELTA_THRESHOLD = 1.0  # Percentage points a metric must move before it is pushed
+    ACTIVITY_LOG_SIZE = 100  # Recent activity entries kept for the GUI
+    ACTIVITY_BATCH_WINDOW = 0.1  # Seconds of activity coalesced into one GUI update
+    GUI_SNAPSHOT_EVENTS = 20  # Recent events replayed to a newly connected GUI client
+    
+    # Action execution settings
+    ACTION_WORKERS = 4
+    ACTION_TIMEOUT = 5.0  # Seconds before an action resolves to a fallback response
+    ACTION_TIMEOUTS = {
+        "get_system_info": 3.0,
+        "web_search": 4.0
+    }
     
     # Conversation settings
     MAX_CONVERSATION_HISTORY = 10
+    CONTEXT_MAX_CHARS = 2000  # Upper bound on get_context() size, summary included (~500 tokens)
+    CONTEXT_SUMMARY_MAX_CHARS = 600  # Share of the budget the rolling summary of evicted turns may use
+    CONTEXT_SUMMARY_LINE_CHARS = 80  # Each evicted turn is folded into one line of at most this length
+    CONVERSATION_DB = DATA_DIR / "conversations.db"  # SQLite (WAL + FTS5) log of every session
+    MEMORY_FLUSH_LINES = 20  # Conversation messages buffered before a write
+    MEMORY_FLUSH_INTERVAL = 2.0  # Seconds before buffered messages are written anyway
     
     @classmethod
     def ensure_directories(cls):
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from config.config import Config
+from utils.logger import get_logger
+
+class ActionExecutor:
+    """Runs command actions on a thread pool with a time budget per action"""
+
+    def __init__(self, max_workers=None, default_timeout=None, timeouts=None):
+        self.logger = get_logger(__name__)
+        self.pool = ThreadPoolExecutor(
+            max_workers=max_workers or Config.ACTION_WORKERS,
+            thread_name_prefix="JarvisAction"
+        )
+        self.default_timeout = default_timeout or Config.ACTION_TIMEOUT
+        self.timeouts = dict(Config.ACTION_TIMEOUTS if timeouts is None else timeouts)
+        # The action keeps running after a timeout, so never ask for a retry (it could open or shut down twice)
+        self.fallback_response = "That is taking a little longer than expected. I'm still working on it."
+
+    def timeout_for(self, action):
+        """Time budget in seconds for the given action"""
+        return self.timeouts.get(action, self.default_timeout)
+
+    def submit(self, action, func, *args):
+        """Start an action without waiting for it; returns a Future"""
+        return self.pool.submit(func, *args)
+
+    def run(self, action, func, *args):
+        """Run an action and wait up to its budget, falling back on timeout"""
+        future = self.submit(action, func, *args)
+        try:
+            return future.result(timeout=self.timeout_for(action))
+        except TimeoutError:
+            # The worker thread finishes in the background; the caller moves on
+            self.logger.warning(f"Action '{action}' exceeded {self.timeout_for(action)}s budget")
+            future.add_done_callback(lambda done: self._log_late_result(action, done))
+            return self.fallback_response
+
+    def _log_late_result(self, action, future):
+        """Log the outcome of an action that finished after its budget"""
+        error = future.exception()
+        if error:
+            self.logger.error(f"Action '{action}' failed after its timeout: {error}")
+        else:
+            self.logger.info(f"Action '{action}' finished after its timeout: {future.result()}")
+
+    def shutdown(self, wait=False):
+        """Stop accepting new actions"""
+        self.pool.shutdown(wait=wait)
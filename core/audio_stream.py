@@ -0,0 +1,175 @@
+import threading
+import time
+import wave
+from collections import deque
+import speech_recognition as sr
+from config.config import Config
+from utils.logger import get_logger
+
+class MicrophoneInput:
+    """Keeps one PyAudio input stream open for the lifetime of the capture"""
+
+    def __init__(self, microphone=None):
+        self.microphone = microphone or sr.Microphone()
+        self.SAMPLE_RATE = self.microphone.SAMPLE_RATE
+        self.SAMPLE_WIDTH = self.microphone.SAMPLE_WIDTH
+        self.CHUNK = self.microphone.CHUNK
+
+    def open(self):
+        self.microphone.__enter__()
+
+    def read(self):
+        return self.microphone.stream.read(self.CHUNK)
+
+    def close(self):
+        if self.microphone.stream is not None:
+            self.microphone.__exit__(None, None, None)
+
+class WavFileInput:
+    """Replays a mono WAV file in place of the microphone, e.g. for headless runs"""
+
+    def __init__(self, path, chunk_size=1024, realtime=False):
+        self.path = path
+        self.CHUNK = chunk_size
+        self.realtime = realtime
+        self.wav = None
+        with wave.open(str(path), 'rb') as wav:
+            if wav.getnchannels() != 1:
+                raise ValueError(f"{path} must be mono audio")
+            self.SAMPLE_RATE = wav.getframerate()
+            self.SAMPLE_WIDTH = wav.getsampwidth()
+
+    def open(self):
+        self.wav = wave.open(str(self.path), 'rb')
+
+    def read(self):
+        if self.realtime:
+            time.sleep(self.CHUNK / self.SAMPLE_RATE)
+        return self.wav.readframes(self.CHUNK)
+
+    def close(self):
+        if self.wav:
+            self.wav.close()
+            self.wav = None
+
+class AudioCapture:
+    """Producer thread that copies audio chunks from an input into a ring buffer"""
+
+    def __init__(self, audio_input, buffer_seconds=None):
+        self.logger = get_logger(__name__)
+        self.input = audio_input
+        self.SAMPLE_RATE = audio_input.SAMPLE_RATE
+        self.SAMPLE_WIDTH = audio_input.SAMPLE_WIDTH
+        self.CHUNK = audio_input.CHUNK
+
+        buffer_seconds = buffer_seconds or Config.AUDIO_BUFFER_SECONDS
+        max_chunks = max(1, int(buffer_seconds * self.SAMPLE_RATE / self.CHUNK))
+        self.buffer = deque(maxlen=max_chunks)
+        self.condition = threading.Condition()
+        self.finished = False
+        self.error = None
+        self.running = False
+        self.dropped_chunks = 0
+        self.taps = []
+        self.thread = None
+
+    def start(self):
+        """Open the input and start capturing"""
+        self.input.open()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="AudioCapture", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        try:
+            while self.running:
+                data = self.input.read()
+                with self.condition:
+                    if not data:
+                        break
+                    if len(self.buffer) == self.buffer.maxlen:
+                        self.dropped_chunks += 1  # Oldest audio is overwritten
+                    self.buffer.append(data)
+                    self.condition.notify_all()
+                for tap in list(self.taps):
+                    tap(data)
+        except Exception as e:
+            self.error = e
+            self.logger.error(f"Audio capture stopped: {e}")
+        finally:
+            with self.condition:
+                self.finished = True
+                self.condition.notify_all()
+
+    def read(self, size=None):
+        """Return the next buffered chunk, blocking until audio arrives; b'' at end of stream"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.buffer or self.finished)
+            if self.buffer:
+                return self.buffer.popleft()
+            return b""
+
+    @property
+    def exhausted(self):
+        """True once capture has stopped and every buffered chunk was read"""
+        with self.condition:
+            return self.finished and not self.buffer
+
+    def add_tap(self, callback):
+        """Also hand every captured chunk to callback, without consuming it from the buffer"""
+        self.taps.append(callback)
+
+    def remove_tap(self, callback):
+        if callback in self.taps:
+            self.taps.remove(callback)
+
+    def flush(self):
+        """Discard buffered audio, e.g. our own TTS output"""
+        with self.condition:
+            self.buffer.clear()
+
+    def close(self):
+        """Stop capturing and release the input"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=1)
+        self.input.close()
+        with self.condition:
+            self.finished = True
+            self.condition.notify_all()
+
+class StreamingAudioSource(sr.AudioSource):
+    """speech_recognition AudioSource that reads from an AudioCapture ring buffer"""
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.stream = capture
+        self.SAMPLE_RATE = capture.SAMPLE_RATE
+        self.SAMPLE_WIDTH = capture.SAMPLE_WIDTH
+        self.CHUNK = capture.CHUNK
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+class ChunkListSource(sr.AudioSource):
+    """AudioSource over already captured chunks, e.g. to recalibrate off the listening path"""
+
+    def __init__(self, chunks, sample_rate, sample_width, chunk_size):
+        self.chunks = deque(chunks)
+        self.stream = self
+        self.SAMPLE_RATE = sample_rate
+        self.SAMPLE_WIDTH = sample_width
+        self.CHUNK = chunk_size
+
+    def read(self, size=None):
+        return self.chunks.popleft() if self.chunks else b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
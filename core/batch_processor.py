@@ -0,0 +1,98 @@
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from core.command_matcher import CommandMatcher
+from core.command_registry import CommandRegistry
+from utils.helpers import normalize_command
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Per-process matcher, built once by the pool initializer
+_worker_matcher = None
+
+def classify(matcher, utterance):
+    """Resolve one utterance to an (utterance, intent, params, score) record"""
+    match = matcher.match(normalize_command(utterance))
+    if match is None:
+        return (utterance, None, [], 0)
+    return (utterance, match.cmd_type, match.params, match.score)
+
+def _init_worker(commands):
+    global _worker_matcher
+    _worker_matcher = CommandMatcher(commands)
+
+def _classify_chunk(chunk):
+    return [classify(_worker_matcher, utterance) for utterance in chunk]
+
+def _chunks(utterances, size):
+    iterator = iter(utterances)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def read_utterances(path):
+    """Yield non-empty lines from a transcript file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+def classify_batch(utterances, commands=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream intent records for many utterances without executing actions.
+
+    Only intent resolution runs: nothing is written to conversation memory and
+    no GUI updates are emitted. With workers > 1 chunks are classified on a
+    process pool; records are yielded in input order either way.
+    """
+    if commands is None:
+        commands = CommandRegistry(Path("data/commands.json")).load().commands
+    if isinstance(utterances, (str, Path)):
+        utterances = read_utterances(utterances)
+
+    if not workers or workers <= 1:
+        matcher = CommandMatcher(commands)
+        for utterance in utterances:
+            yield classify(matcher, utterance)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(commands,)) as executor:
+        # Keep a bounded number of chunks in flight so large files stream
+        pending = []
+        for chunk in _chunks(utterances, chunk_size):
+            pending.append(executor.submit(_classify_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.pop(0).result()
+        for future in pending:
+            yield from future.result()
+
+def main(argv=None):
+    """Command line entry point: classify a transcript file into JSON lines"""
+    parser = argparse.ArgumentParser(description="Classify utterances against commands.json")
+    parser.add_argument("input", help="Transcript file with one utterance per line, or '-' for stdin")
+    parser.add_argument("-o", "--output", help="Write JSON lines here instead of stdout")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        utterances = (line.strip() for line in sys.stdin if line.strip())
+    else:
+        utterances = read_utterances(args.input)
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for utterance, intent, params, score in classify_batch(utterances, workers=args.workers, chunk_size=args.chunk_size):
+            record = {"utterance": utterance, "intent": intent, "params": params, "score": score}
+            out.write(json.dumps(record) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == "__main__":
+    main()
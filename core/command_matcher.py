@@ -0,0 +1,228 @@
+import argparse
+import json
+import re
+import time
+from collections import defaultdict, namedtuple
+from fuzzywuzzy import fuzz
+
+# rapidfuzz scores a query against a whole list of patterns in one C++ call
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+MATCH_THRESHOLD = 70
+WILDCARD_SCORE = 90
+PREFILTER_MARGIN = 1  # Slack for the rapidfuzz prefilter; its scores are floats, fuzzywuzzy rounds
+
+# Result of matching a command; params holds the wildcard captures
+CommandMatch = namedtuple("CommandMatch", ["cmd_type", "cmd_data", "pattern", "score", "params"])
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return re.findall(r"\w+", text.lower())
+
+def trigrams(token):
+    """Character trigrams of a token, used for typo-tolerant lookup"""
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+def batch_partial_ratio(query, choices, cutoff=MATCH_THRESHOLD):
+    """fuzzywuzzy partial_ratio of query against every choice; 0 where it cannot exceed cutoff"""
+    if not choices:
+        return []
+    if RAPIDFUZZ_AVAILABLE:
+        # rapidfuzz scores the optimal alignment, so it is never below fuzzywuzzy by more than
+        # rounding; one C++ call rules out most choices and only the rest are rescored, which
+        # keeps scores (and MATCH_THRESHOLD) identical with or without rapidfuzz
+        bounds = rf_process.cdist(
+            [query], choices, scorer=rf_fuzz.partial_ratio, score_cutoff=cutoff - PREFILTER_MARGIN
+        )[0]
+        return [fuzz.partial_ratio(choice, query) if bound else 0 for choice, bound in zip(choices, bounds)]
+    return [fuzz.partial_ratio(choice, query) for choice in choices]
+
+def compile_category(cmd_data):
+    """Compile the patterns of one category into (pattern, regex, tokens, grams) tuples"""
+    compiled = []
+    for pattern in cmd_data.get("patterns", []):
+        tokens = tokenize(pattern.replace("*", " "))
+        if "*" in pattern:
+            regex = re.compile(pattern.replace("*", "(.+)"))
+            grams = set()
+        else:
+            regex = None
+            grams = set().union(*(trigrams(token) for token in tokens))
+        compiled.append((pattern, regex, tokens, grams))
+    return compiled
+
+class CommandMatcher:
+    """Precompiled index over the command patterns in commands.json"""
+
+    def __init__(self, commands, previous=None):
+        self.commands = commands
+        self.categories = {}            # cmd_type -> (cmd_data, compiled patterns)
+        self.entries = []               # (cmd_type, pattern, compiled regex or None)
+        self.exact_phrases = {}         # literal pattern -> entry id
+        self.token_index = defaultdict(set)
+        self.gram_index = defaultdict(set)
+        self.always_candidates = set()  # wildcards and literals too short to have trigrams
+        self.literal_patterns = []      # flat array of literal patterns for batch scoring
+        self.literal_ids = []           # entry id of each literal_patterns slot
+        self.literal_slots = {}         # entry id -> literal_patterns slot
+
+        # Regexes, tokens and trigrams of unchanged categories are reused; the
+        # lookup tables below are always rebuilt, since entry ids are positional
+        for cmd_type, cmd_data in commands.items():
+            cached = previous.categories.get(cmd_type) if previous else None
+            if cached and cached[0] == cmd_data:
+                compiled = cached[1]
+            else:
+                compiled = compile_category(cmd_data)
+            self.categories[cmd_type] = (cmd_data, compiled)
+
+            for pattern, regex, tokens, grams in compiled:
+                self._add_pattern(cmd_type, pattern, regex, tokens, grams)
+
+    def changed_categories(self, previous):
+        """Names of categories that were added, removed or recompiled since previous"""
+        if previous is None:
+            return set(self.categories)
+        names = set(self.categories) | set(previous.categories)
+        return {
+            name for name in names
+            if self.categories.get(name, (None, None))[1] is not previous.categories.get(name, (None, None))[1]
+        }
+
+    def _add_pattern(self, cmd_type, pattern, regex, tokens, grams):
+        """Register a compiled pattern in the lookup tables"""
+        entry_id = len(self.entries)
+        self.entries.append((cmd_type, pattern, regex))
+
+        if regex is not None:
+            # re.search also matches inside words ("reopen file" -> "open *"), which tokens miss
+            self.always_candidates.add(entry_id)
+        else:
+            if not grams:
+                self.always_candidates.add(entry_id)
+            self.exact_phrases.setdefault(pattern.lower().strip(), entry_id)
+            self.literal_slots[entry_id] = len(self.literal_patterns)
+            self.literal_patterns.append(pattern)
+            self.literal_ids.append(entry_id)
+            for gram in grams:
+                self.gram_index[gram].add(entry_id)
+
+        for token in tokens:
+            self.token_index[token].add(entry_id)
+
+    def candidates(self, command):
+        """Entry ids sharing a token or trigram with the command, plus every wildcard and short literal"""
+        found = set(self.always_candidates)
+        for token in tokenize(command):
+            found |= self.token_index.get(token, set())
+            for gram in trigrams(token):
+                found |= self.gram_index.get(gram, set())
+        return sorted(found)
+
+    def score(self, entry_id, command):
+        """Score one indexed pattern against the command, returning (score, params)"""
+        _, pattern, regex = self.entries[entry_id]
+        if regex is not None:
+            found = regex.search(command)
+            if not found:
+                return 0, []
+            return WILDCARD_SCORE, [group.strip() for group in found.groups()]
+        return fuzz.partial_ratio(pattern, command), []
+
+    def _result(self, entry_id, score, params):
+        cmd_type, pattern, _ = self.entries[entry_id]
+        return CommandMatch(cmd_type, self.commands[cmd_type], pattern, score, params)
+
+    def score_candidates(self, command, entry_ids):
+        """Score candidate entries, batching every literal pattern into one fuzzy call"""
+        scored = {}
+        literal_ids = []
+        for entry_id in entry_ids:
+            if self.entries[entry_id][2] is None:
+                literal_ids.append(entry_id)
+            else:
+                scored[entry_id] = self.score(entry_id, command)
+
+        # Score against the whole flat array when the index could not narrow much
+        if len(literal_ids) * 2 > len(self.literal_patterns):
+            literal_ids = self.literal_ids
+            choices = self.literal_patterns
+        else:
+            choices = [self.literal_patterns[self.literal_slots[entry_id]] for entry_id in literal_ids]
+
+        for entry_id, score in zip(literal_ids, batch_partial_ratio(command, choices)):
+            scored[entry_id] = (score, [])
+        return scored
+
+    def top_matches(self, command, limit=3):
+        """Return up to limit CommandMatches above the threshold, best first"""
+        scored = self.score_candidates(command, self.candidates(command))
+        ranked = sorted(
+            (entry_id for entry_id, (score, _) in scored.items() if score > MATCH_THRESHOLD),
+            key=lambda entry_id: (-scored[entry_id][0], entry_id)
+        )
+        return [self._result(entry_id, *scored[entry_id]) for entry_id in ranked[:limit]]
+
+    def match(self, command):
+        """Return the best CommandMatch for the command, or None"""
+        entry_id = self.exact_phrases.get(command)
+        if entry_id is not None:
+            return self._result(entry_id, 100, [])
+
+        best = self.top_matches(command, limit=1)
+        return best[0] if best else None
+
+def legacy_find_best_match(commands, command):
+    """The previous per-call loop over every pattern, kept for parity checks"""
+    best_score = 0
+    best_match = None
+    for cmd_type, cmd_data in commands.items():
+        for pattern in cmd_data["patterns"]:
+            if "*" in pattern:
+                score = WILDCARD_SCORE if re.search(pattern.replace("*", "(.+)"), command) else 0
+            else:
+                score = fuzz.partial_ratio(pattern, command)
+            if score > best_score and score > MATCH_THRESHOLD:
+                best_score = score
+                best_match = (cmd_type, pattern)
+    return best_match
+
+def compare(corpus_path, commands):
+    """Time legacy vs. indexed matching over a corpus of commands and report disagreements"""
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        lines = [line.strip().lower() for line in f if line.strip() and not line.startswith('#')]
+
+    matcher = CommandMatcher(commands)
+    start = time.perf_counter()
+    legacy = [legacy_find_best_match(commands, line) for line in lines]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = [matcher.match(line) for line in lines]
+    current_time = time.perf_counter() - start
+
+    print(f"{len(lines)} commands")
+    print(f"legacy:  {legacy_time / len(lines) * 1e6:8.1f} us/command")
+    print(f"matcher: {current_time / len(lines) * 1e6:8.1f} us/command")
+    differences = 0
+    for line, old, new in zip(lines, legacy, current):
+        old_type = old[0] if old else None
+        new_type = new.cmd_type if new else None
+        if old_type != new_type:
+            differences += 1
+            print(f"  differs: {line!r} legacy={old_type} matcher={new_type}")
+    print(f"{differences} differences")
+    return differences
+
+if __name__ == "__main__":
+    from config.config import Config
+    parser = argparse.ArgumentParser(description="Check the command matcher against the legacy loop")
+    parser.add_argument("corpus", nargs="?", default=str(Config.DATA_DIR / "command_corpus.txt"))
+    parser.add_argument("--commands", default=str(Config.DATA_DIR / "commands.json"))
+    args = parser.parse_args()
+    with open(args.commands, 'r') as f:
+        compare(args.corpus, json.load(f))
@@ -0,0 +1,86 @@
+import json
+import threading
+from pathlib import Path
+from config.config import Config
+from core.command_matcher import CommandMatcher
+from utils.logger import get_logger
+
+class CommandRegistry:
+    """Holds the live CommandMatcher and reloads it when commands.json changes"""
+
+    def __init__(self, commands_file):
+        self.commands_file = Path(commands_file)
+        self.logger = get_logger(__name__)
+        self.matcher = None
+        self.mtime = None
+        self.reload_lock = threading.Lock()
+        self.listeners = []
+        self.stop_event = threading.Event()
+        self.watch_thread = None
+
+    def add_listener(self, callback):
+        """Register a callback run with the new matcher after every reload"""
+        self.listeners.append(callback)
+
+    def load(self):
+        """Read commands.json and swap in a freshly built matcher"""
+        with self.reload_lock:
+            mtime = self.commands_file.stat().st_mtime
+            with open(self.commands_file, 'r') as f:
+                commands = json.load(f)
+
+            previous = self.matcher
+            matcher = CommandMatcher(commands, previous)
+            # Single attribute assignment, so in-flight lookups keep the old matcher
+            self.matcher = matcher
+            self.mtime = mtime
+
+        changed = matcher.changed_categories(previous)
+        if previous is not None:
+            self.logger.info(
+                f"Reloaded commands, recompiled categories: {sorted(changed) or 'none'}; "
+                f"lookup tables rebuilt for all {len(matcher.categories)} categories"
+            )
+
+        for callback in self.listeners:
+            try:
+                callback(matcher)
+            except Exception as e:
+                self.logger.error(f"Error in command reload listener: {e}")
+        return matcher
+
+    def reload_if_changed(self):
+        """Reload the commands file if its mtime moved; returns True if reloaded"""
+        try:
+            mtime = self.commands_file.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if mtime == self.mtime:
+            return False
+
+        try:
+            self.load()
+            return True
+        except (ValueError, OSError) as e:
+            # Keep serving the last good index while the file is mid-edit or invalid
+            self.logger.error(f"Error reloading commands: {e}")
+            self.mtime = mtime
+            return False
+
+    def start_watching(self, interval=None):
+        """Poll the commands file for changes on a daemon thread"""
+        if self.watch_thread and self.watch_thread.is_alive():
+            return
+        interval = interval or Config.COMMANDS_RELOAD_INTERVAL
+        self.stop_event.clear()
+
+        def watch():
+            while not self.stop_event.wait(interval):
+                self.reload_if_changed()
+
+        self.watch_thread = threading.Thread(target=watch, name="CommandRegistryWatcher", daemon=True)
+        self.watch_thread.start()
+
+    def stop_watching(self):
+        """Stop the file watcher thread"""
+        self.stop_event.set()
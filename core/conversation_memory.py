@@ -1,44 +1,186 @@
-import json
-import os
+import atexit
+import queue
+import threading
+import time
+import uuid
+from collections import deque
 from config.config import Config
+from core.conversation_store import ConversationStore, day_range
+from utils.helpers import split_sentences
 from utils.logger import get_logger
 
+_CLOSE = object()
+SUMMARY_HEADER = "Earlier in this conversation:\n"
+
 class ConversationMemory:
-    def __init__(self, max_history=10):
-        self.conversation_history = []
+    def __init__(self, max_history=10, max_chars=None):
+        self.conversation_history = deque()
         self.max_history = max_history
+        self.max_chars = max_chars or Config.CONTEXT_MAX_CHARS
+        self.history_chars = 0
         self.logger = get_logger(__name__)
-        self.memory_file = Config.DATA_DIR / "conversation_log.txt"
+
+        # Evicted turns, each folded once into a short line; oldest lines drop off past the summary budget
+        self.summary_lines = deque()
+        self.summary_chars = 0
+        self.summarized_count = 0
+        self.omitted_count = 0
+        self.store = ConversationStore()
+        self.session_id = uuid.uuid4().hex
+
+        # Messages are written in batches by one thread holding the database open
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, name="ConversationWriter", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
         
     def add_user_message(self, message):
         """Add user message to conversation history"""
-        self.conversation_history.append({"role": "user", "content": message})
-        self._trim_history()
-        self._save_to_file(f"USER: {message}")
+        self._append("user", message)
+        self._save_to_file("user", message)
     
     def add_assistant_message(self, message):
         """Add assistant message to conversation history"""
-        self.conversation_history.append({"role": "assistant", "content": message})
-        self._trim_history()
-        self._save_to_file(f"ASSISTANT: {message}")
+        self._append("assistant", message)
+        self._save_to_file("assistant", message)
     
+    def _append(self, role, message):
+        self.conversation_history.append({"role": role, "content": message})
+        self.history_chars += len(message)
+        self._trim_history()
+
     def _trim_history(self):
-        """Keep only recent conversation history"""
-        if len(self.conversation_history) > self.max_history:
-            self.conversation_history = self.conversation_history[-self.max_history:]
-    
-    def _save_to_file(self, message):
-        """Save conversation to file"""
+        """Evict oldest turns into the summary until count and character budget fit; the newest turn stays"""
+        while len(self.conversation_history) > 1 and (
+            len(self.conversation_history) > self.max_history
+            or self.history_chars + self._summary_size() > self.max_chars
+        ):
+            turn = self.conversation_history.popleft()
+            self.history_chars -= len(turn["content"])
+            self._summarize(turn)
+
+    def _summarize(self, turn):
+        """Fold one evicted turn into the rolling summary"""
+        speaker = "User" if turn["role"] == "user" else "JARVIS"
+        gist = (split_sentences(turn["content"], Config.CONTEXT_SUMMARY_LINE_CHARS) or [""])[0]
+        if len(gist) > Config.CONTEXT_SUMMARY_LINE_CHARS:
+            gist = gist[:Config.CONTEXT_SUMMARY_LINE_CHARS - 3] + "..."
+        line = f"{speaker}: {gist}"
+        self.summary_lines.append(line)
+        self.summary_chars += len(line) + 1
+        self.summarized_count += 1
+
+        while self.summary_chars > min(Config.CONTEXT_SUMMARY_MAX_CHARS, self.max_chars) and self.summary_lines:
+            self.summary_chars -= len(self.summary_lines.popleft()) + 1
+            self.omitted_count += 1
+
+    def _summary_size(self):
+        """len(get_summary()) without building the string"""
+        if not self.summarized_count:
+            return 0
+        size = len(SUMMARY_HEADER) + self.summary_chars - 1
+        if self.omitted_count:
+            size += len(f"({self.omitted_count} earlier messages omitted)") + 1
+        return size
+
+    def get_summary(self, max_chars=None):
+        """Rolling summary of turns that no longer fit in the context window, at most max_chars long"""
+        if not self.summarized_count:
+            return ""
+        lines = list(self.summary_lines)
+        omitted = self.omitted_count
+        while True:
+            header = [f"({omitted} earlier messages omitted)"] if omitted else []
+            summary = SUMMARY_HEADER + "\n".join(header + lines)
+            if max_chars is None or len(summary) <= max_chars:
+                return summary
+            if not lines:
+                return ""  # Not even the header fits
+            lines.pop(0)
+            omitted += 1
+
+    def _save_to_file(self, role, message):
+        """Queue a message for the background writer"""
+        self.pending.put((self.session_id, role, message, time.time()))
+
+    def _write_loop(self):
+        """Append queued messages, committing every MEMORY_FLUSH_LINES messages or MEMORY_FLUSH_INTERVAL seconds"""
+        batch = []
+        batch_started = None
+        closing = False
         try:
-            with open(self.memory_file, 'a', encoding='utf-8') as f:
-                f.write(f"{message}\n")
+            conn = self.store.connect()
         except Exception as e:
-            self.logger.error(f"Error saving conversation: {e}")
+            self.logger.error(f"Error opening conversation store: {e}")
+            return
+
+        try:
+            while not closing:
+                wait = None
+                if batch:
+                    wait = max(0.0, Config.MEMORY_FLUSH_INTERVAL - (time.monotonic() - batch_started))
+                try:
+                    item = self.pending.get(timeout=wait)
+                    if item is _CLOSE:
+                        closing = True
+                    else:
+                        if not batch:
+                            batch_started = time.monotonic()
+                        batch.append(item)
+                except queue.Empty:
+                    pass
+
+                if not batch:
+                    continue
+                due = time.monotonic() - batch_started >= Config.MEMORY_FLUSH_INTERVAL
+                if closing or due or len(batch) >= Config.MEMORY_FLUSH_LINES:
+                    try:
+                        self.store.append(conn, batch)
+                    except Exception as e:
+                        self.logger.error(f"Error saving conversation: {e}")
+                    batch = []
+        finally:
+            conn.close()
+
+    def close(self, timeout=None):
+        """Write out any queued lines and stop the writer"""
+        if self.writer.is_alive():
+            self.pending.put(_CLOSE)
+            self.writer.join(timeout)
     
     def get_context(self):
-        """Get conversation context"""
-        return self.conversation_history
+        """Get conversation context: the rolling summary, if any, then recent turns, within max_chars"""
+        context = []
+        # Recent turns come first; the summary gets whatever room they leave
+        summary = self.get_summary(max(0, self.max_chars - self.history_chars))
+        if summary:
+            context.append({"role": "system", "content": summary})
+
+        room = self.max_chars - len(summary)
+        for turn in self.conversation_history:
+            if len(turn["content"]) > room:
+                # Only the newest turn can be this long, and then there is no summary; clip it
+                turn = {"role": turn["role"], "content": turn["content"][:max(0, room)]}
+            context.append(turn)
+            room -= len(turn["content"])
+        return context
     
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
\ No newline at end of file
+        self.conversation_history.clear()
+        self.history_chars = 0
+        self.summary_lines.clear()
+        self.summary_chars = 0
+        self.summarized_count = 0
+        self.omitted_count = 0
+
+    def recall(self, query=None, days_ago=None, role=None, limit=20):
+        """Search all past sessions, e.g. recall("weather", days_ago=1, role="user") for yesterday's questions"""
+        since = until = None
+        if days_ago is not None:
+            since, until = day_range(days_ago)
+        return self.store.search(query, since=since, until=until, role=role, limit=limit)
+
+    def session_history(self, limit=None):
+        """Everything said in this session, including turns no longer in the context window"""
+        return self.store.session(self.session_id, limit)
@@ -0,0 +1,121 @@
+import sqlite3
+import time
+from config.config import Config
+from utils.logger import get_logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_created_at ON messages (created_at);
+CREATE INDEX IF NOT EXISTS messages_session ON messages (session_id, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5 (
+    content, content='messages', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, content) VALUES (new.id, new.content);
+END;
+"""
+
+class ConversationStore:
+    """Append-only SQLite log of every message, full-text indexed with FTS5"""
+
+    def __init__(self, path=None):
+        self.logger = get_logger(__name__)
+        self.path = str(path or Config.CONVERSATION_DB)
+        conn = self.connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def connect(self):
+        """New connection; WAL lets the writer and any number of readers work at once"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def append(self, conn, rows):
+        """Insert (session_id, role, content, created_at) rows in one transaction"""
+        with conn:
+            conn.executemany(
+                "INSERT INTO messages (session_id, role, content, created_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+
+    def search(self, query=None, since=None, until=None, role=None, session_id=None, limit=20):
+        """Most recent messages matching an FTS5 query and/or time, role and session filters"""
+        try:
+            conn = self.connect()
+            try:
+                return self._search(conn, query, since, until, role, session_id, limit)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error searching conversations: {e}")
+            return []
+
+    def _search(self, conn, query, since, until, role, session_id, limit):
+        # With a text query the FTS index drives the scan newest first, so LIMIT stops it early
+        if query:
+            source = "messages_fts JOIN messages m ON m.id = messages_fts.rowid"
+            id_column = "messages_fts.rowid"
+            clauses, params = ["messages_fts MATCH ?"], [fts_query(query)]
+        else:
+            source, id_column = "messages m", "m.id"
+            clauses, params = [], []
+
+        if since is not None or until is not None:
+            # The id range bounds the scan via the index; ids follow flush order, which can
+            # interleave across sessions, so created_at is still checked row by row
+            window = (since if since is not None else float('-inf'), until if until is not None else float('inf'))
+            low, high = conn.execute(
+                "SELECT MIN(id), MAX(id) FROM messages WHERE created_at >= ? AND created_at < ?", window
+            ).fetchone()
+            if low is None:
+                return []
+            clauses.append(f"{id_column} BETWEEN ? AND ?")
+            clauses.append("m.created_at >= ? AND m.created_at < ?")
+            params += [low, high, *window]
+        if role:
+            clauses.append("m.role = ?")
+            params.append(role)
+        if session_id:
+            clauses.append("m.session_id = ?")
+            params.append(session_id)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT m.* FROM {source} {where} ORDER BY {id_column} DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in conn.execute(sql, params)]
+
+    def session(self, session_id, limit=None):
+        """Messages of one session in the order they were said"""
+        sql = "SELECT * FROM messages WHERE session_id = ? ORDER BY id"
+        params = [session_id]
+        if limit:
+            sql = f"SELECT * FROM ({sql} DESC LIMIT ?) ORDER BY id"
+            params.append(limit)
+        conn = self.connect()
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+def fts_query(text):
+    """Quote each word so user text cannot be parsed as FTS5 syntax"""
+    words = [word.replace('"', '""') for word in text.split()]
+    return " ".join(f'"{word}"' for word in words)
+
+def day_range(days_ago=0):
+    """(start, end) epoch seconds of a local calendar day, e.g. days_ago=1 for yesterday"""
+    now = time.localtime()
+    start = time.mktime((now.tm_year, now.tm_mon, now.tm_mday - days_ago, 0, 0, 0, 0, 0, -1))
+    end = time.mktime((now.tm_year, now.tm_mon, now.tm_mday - days_ago + 1, 0, 0, 0, 0, 0, -1))
+    return start, end
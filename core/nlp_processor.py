@@ -1,33 +1,60 @@
 import json
-import re
+from functools import lru_cache
 from pathlib import Path
-from fuzzywuzzy import fuzz
+from config.config import Config
 from modules.system_control import SystemController
 from modules.web_services import WebServices
 from modules.file_manager import FileManager
 from modules.entertainment import Entertainment
+from core.command_registry import CommandRegistry
+from core.batch_processor import classify_batch
+from core.action_executor import ActionExecutor
+from utils.helpers import normalize_command
 from utils.logger import get_logger
 
 class NLPProcessor:
-    def __init__(self):
+    def __init__(self, watch_commands=True):
         self.logger = get_logger(__name__)
         self.system_controller = SystemController()
         self.web_services = WebServices()
         self.file_manager = FileManager()
         self.entertainment = Entertainment()
         
-        # Load command patterns
+        # Map action names to handlers once; each handler takes the wildcard params
+        self.action_map = self.build_action_map()
+        
+        # Run actions off the caller's thread so a slow one cannot stall the voice loop
+        self.executor = ActionExecutor()
+        
+        # Cache intent resolution (not action output) for repeated utterances
+        self._cached_match = lru_cache(maxsize=Config.INTENT_CACHE_SIZE)(self._match_with)
+        self.cache_hits = 0  # Totals from before the last reload; cache_clear() zeroes cache_info()
+        self.cache_misses = 0
+        
+        # Load command patterns and pick up edits without a restart
+        self.registry = CommandRegistry(Path("data/commands.json"))
+        self.registry.add_listener(lambda matcher: self._clear_intent_cache())
         self.load_commands()
+        if watch_commands:
+            self.registry.start_watching()
+        
+    @property
+    def matcher(self):
+        """Current command matcher; swapped atomically on reload"""
+        return self.registry.matcher
+        
+    @property
+    def commands(self):
+        """Current command patterns"""
+        return self.registry.matcher.commands
         
     def load_commands(self):
         """Load command patterns from JSON file"""
-        commands_file = Path("data/commands.json")
-        try:
-            with open(commands_file, 'r') as f:
-                self.commands = json.load(f)
-        except FileNotFoundError:
-            self.commands = self.create_default_commands()
-            self.save_commands()
+        if not self.registry.commands_file.exists():
+            self.save_commands(self.create_default_commands())
+        
+        # Build the matching index once instead of on every command
+        self.registry.load()
             
     def create_default_commands(self):
         """Create default command patterns"""
@@ -66,54 +93,68 @@ class NLPProcessor:
             }
         }
         
-    def save_commands(self):
+    def save_commands(self, commands=None):
         """Save commands to JSON file"""
-        commands_file = Path("data/commands.json")
-        with open(commands_file, 'w') as f:
-            json.dump(self.commands, f, indent=2)
+        if commands is None:
+            commands = self.commands
+        with open(self.registry.commands_file, 'w') as f:
+            json.dump(commands, f, indent=2)
             
     def process_command(self, command, memory=None):
         """Process natural language command"""
-        command = command.lower().strip()
-        best_match = self.find_best_match(command)
+        command = normalize_command(command)
+        best_match = self.resolve_intent(command)
         
         if best_match:
             return self.execute_command(best_match, command, memory)
         else:
             return self.handle_unknown_command(command, memory)
             
+    def classify_batch(self, utterances, workers=None):
+        """Stream (utterance, intent, params, score) records without running actions"""
+        return classify_batch(utterances, self.commands, workers=workers)
+        
     def find_best_match(self, command):
         """Find best matching command pattern"""
-        best_score = 0
-        best_match = None
-        
-        for cmd_type, cmd_data in self.commands.items():
-            for pattern in cmd_data["patterns"]:
-                if "*" in pattern:
-                    # Handle wildcard patterns
-                    pattern_regex = pattern.replace("*", "(.+)")
-                    if re.search(pattern_regex, command):
-                        score = 90  # High score for wildcard matches
-                    else:
-                        score = 0
-                else:
-                    # Use fuzzy matching for exact patterns
-                    score = fuzz.partial_ratio(pattern, command)
-                
-                if score > best_score and score > 70:  # Threshold for matching
-                    best_score = score
-                    best_match = (cmd_type, cmd_data, pattern)
-                    
-        return best_match
+        return self.registry.matcher.match(command)
+        
+    def resolve_intent(self, command):
+        """Find best matching command pattern, memoized on the normalized command"""
+        # The matcher is part of the key so a lookup racing a reload is never reused
+        return self._cached_match(self.registry.matcher, normalize_command(command))
+        
+    def _match_with(self, matcher, command):
+        return matcher.match(command)
+        
+    def _clear_intent_cache(self):
+        """Drop cached intents after a reload, keeping the hit/miss totals"""
+        info = self._cached_match.cache_info()
+        self.cache_hits += info.hits
+        self.cache_misses += info.misses
+        self._cached_match.cache_clear()
+
+    def cache_stats(self):
+        """Cumulative hit/miss counters of the intent cache for monitoring"""
+        info = self._cached_match.cache_info()
+        hits = self.cache_hits + info.hits
+        misses = self.cache_misses + info.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'size': info.currsize,
+            'max_size': info.maxsize,
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
         
     def execute_command(self, match, original_command, memory):
         """Execute the matched command"""
-        cmd_type, cmd_data, pattern = match
+        cmd_data = match.cmd_data
         
         try:
             if "action" in cmd_data:
                 action = cmd_data["action"]
-                return self.call_action(action, original_command, pattern)
+                return self.call_action(action, match.params)
             elif "responses" in cmd_data:
                 import random
                 return random.choice(cmd_data["responses"])
@@ -121,29 +162,23 @@ class NLPProcessor:
             self.logger.error(f"Error executing command: {e}")
             return "Sorry, I encountered an error processing that command."
             
-    def call_action(self, action, command, pattern):
-        """Call the appropriate action method"""
-        # Extract parameters for wildcard patterns
-        params = []
-        if "*" in pattern:
-            pattern_regex = pattern.replace("*", "(.+)")
-            match = re.search(pattern_regex, command)
-            if match:
-                params = [group.strip() for group in match.groups()]
-        
-        # Map actions to methods
-        action_map = {
-            "get_system_info": self.system_controller.get_system_info,
-            "open_application": lambda: self.system_controller.open_application(params[0] if params else ""),
-            "get_weather": self.web_services.get_weather,
-            "web_search": lambda: self.web_services.search_web(params[0] if params else ""),
-            "get_time": self.system_controller.get_current_time,
-            "tell_joke": self.entertainment.tell_joke,
-            "shutdown_system": self.system_controller.shutdown_system
+    def build_action_map(self):
+        """Map action names to methods"""
+        return {
+            "get_system_info": lambda params: self.system_controller.get_system_info(),
+            "open_application": lambda params: self.system_controller.open_application(params[0] if params else ""),
+            "get_weather": lambda params: self.web_services.get_weather(),
+            "web_search": lambda params: self.web_services.search_web(params[0] if params else ""),
+            "get_time": lambda params: self.system_controller.get_current_time(),
+            "tell_joke": lambda params: self.entertainment.tell_joke(),
+            "shutdown_system": lambda params: self.system_controller.shutdown_system()
         }
         
-        if action in action_map:
-            return action_map[action]()
+    def call_action(self, action, params):
+        """Call the appropriate action method with params captured during matching"""
+        handler = self.action_map.get(action)
+        if handler:
+            return self.executor.run(action, handler, params)
         else:
             return f"Action '{action}' not implemented yet."
             
@@ -0,0 +1,95 @@
+import json
+from abc import ABC, abstractmethod
+import speech_recognition as sr
+from config.config import Config
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class RecognitionBackend(ABC):
+    """Turns an sr.AudioData into (text, confidence), or None when nothing was recognized"""
+
+    name = "base"
+    multilingual = True  # False for engines whose model fixes the language
+
+    @abstractmethod
+    def recognize(self, audio, language):
+        """(text, confidence) for the audio, or None"""
+
+class GoogleBackend(RecognitionBackend):
+    """Google Web Speech API through speech_recognition"""
+
+    name = "google"
+
+    def __init__(self, recognizer=None):
+        self.recognizer = recognizer or sr.Recognizer()
+
+    def recognize(self, audio, language):
+        try:
+            result = self.recognizer.recognize_google(audio, language=language, show_all=True)
+        except sr.UnknownValueError:
+            return None
+        if not result or not result.get('alternative'):
+            return None
+
+        best = result['alternative'][0]
+        # Google only sometimes reports confidence; a bare transcript is taken at face value
+        return best['transcript'].strip(), best.get('confidence', 1.0)
+
+class SphinxBackend(RecognitionBackend):
+    """Offline CMU Sphinx through speech_recognition (needs pocketsphinx)"""
+
+    name = "sphinx"
+    multilingual = False
+
+    def __init__(self, recognizer=None, keywords=None, sensitivity=None):
+        import pocketsphinx  # noqa: F401 - fail at construction, not on first utterance
+        self.recognizer = recognizer or sr.Recognizer()
+        # With keywords Sphinx only spots those phrases, which is cheap and robust for wake words.
+        # speech_recognition takes sensitivity on a 0-1 scale and maps it to a 1e(100*s-110) threshold
+        sensitivity = Config.WAKE_KEYWORD_SENSITIVITY if sensitivity is None else sensitivity
+        self.keyword_entries = [(keyword, sensitivity) for keyword in keywords] if keywords else None
+
+    def recognize(self, audio, language):
+        try:
+            text = self.recognizer.recognize_sphinx(audio, keyword_entries=self.keyword_entries)
+        except sr.UnknownValueError:
+            return None
+        text = text.strip()
+        return (text, 1.0) if text else None
+
+class VoskBackend(RecognitionBackend):
+    """Offline Kaldi recognition with a local Vosk model directory"""
+
+    name = "vosk"
+    multilingual = False
+
+    def __init__(self, model_path=None):
+        from vosk import Model, KaldiRecognizer
+        self.KaldiRecognizer = KaldiRecognizer
+        # Loading the model is the slow part, so it happens once
+        self.model = Model(str(model_path or Config.VOSK_MODEL_PATH))
+
+    def recognize(self, audio, language):
+        recognizer = self.KaldiRecognizer(self.model, audio.sample_rate)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+
+        text = result.get('text', '').strip()
+        if not text:
+            return None
+        words = result.get('result', [])
+        confidence = sum(word.get('conf', 1.0) for word in words) / len(words) if words else 1.0
+        return text, confidence
+
+def create_backend(name, recognizer=None, keywords=None):
+    """Build a backend by name, falling back to Google if an offline engine is unavailable"""
+    try:
+        if name == "sphinx":
+            return SphinxBackend(recognizer, keywords=keywords)
+        if name == "vosk":
+            return VoskBackend()
+    except Exception as e:
+        logger.warning(f"Offline recognizer '{name}' unavailable ({e}); using Google")
+    return GoogleBackend(recognizer)
@@ -1,13 +1,42 @@
 # REPLACE: core/speech_recognition.py
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 import speech_recognition as sr
+from config.config import Config
+from core.audio_stream import AudioCapture, ChunkListSource, MicrophoneInput, StreamingAudioSource
+from core.recognition_backends import create_backend
+from core.wake_word_spotter import WakeWordSpotter
+from core.vad import VoiceActivityDetector
 from utils.logger import get_logger
 
 class SpeechRecognizer:
-    def __init__(self):
+    def __init__(self, audio_input=None, continuous=None, backend=None, locales=None, wake_backend=None):
+        """audio_input replaces the microphone (e.g. WavFileInput); continuous keeps one stream open"""
+        self.capture = None
+        self.source = None
+        self.locales = list(locales or Config.SPEECH_LOCALES)
+        self.deadline = Config.SPEECH_RECOGNITION_DEADLINE
+        self.min_confidence = Config.SPEECH_MIN_CONFIDENCE
+        self.executor = ThreadPoolExecutor(max_workers=len(self.locales), thread_name_prefix="Recognize")
+        if continuous is None:
+            continuous = Config.SPEECH_CONTINUOUS_CAPTURE
         try:
             self.recognizer = sr.Recognizer()
-            self.microphone = sr.Microphone()
+            self.microphone = sr.Microphone() if audio_input is None else None
             self.logger = get_logger(__name__)
+            # Commands and wake words can use different engines, e.g. offline wake loop
+            self.backend = backend or create_backend(Config.SPEECH_COMMAND_BACKEND, self.recognizer)
+            self.wake_backend = wake_backend or create_backend(
+                Config.SPEECH_WAKE_BACKEND, self.recognizer, keywords=Config.WAKE_KEYWORDS
+            )
+            
+            # Keyword spotting on raw audio decides whether a wake clip is worth recognizing
+            self.wake_spotter = WakeWordSpotter.from_directory() if Config.WAKE_SPOTTER_ENABLED else None
+            
+            # Voice activity detection end-points phrases and drops non-speech before recognition
+            self.vad = VoiceActivityDetector() if Config.VAD_ENABLED else None
             
             # Improved recognition settings
             self.recognizer.energy_threshold = 300  # Adjust for background noise
@@ -19,51 +48,182 @@ class SpeechRecognizer:
             self.recognizer.phrase_threshold = 0.3  # Minimum seconds of speaking audio before we consider the speaking audio a phrase
             self.recognizer.non_speaking_duration = 0.5  # Seconds of non-speaking audio to keep on both sides of the recording
             
-            # Calibrate for ambient noise
-            print("🎤 Calibrating microphone for background noise... (speak normally)")
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=2)
-            print("✅ Microphone calibration complete!")
+            # Keep one input stream open and segment phrases from its ring buffer
+            if continuous or audio_input is not None:
+                self.capture = AudioCapture(audio_input or MicrophoneInput(self.microphone)).start()
+                self.source = StreamingAudioSource(self.capture)
+            else:
+                self.source = self.microphone
+            
+            # Reuse the last calibration when possible; only calibrate inline without one
+            if self.load_calibration():
+                print("✅ Using saved microphone calibration")
+                if self.capture:
+                    self.recalibrate_in_background()
+            else:
+                self.calibrate()
             
         except Exception as e:
             print(f"Speech Recognition Error: {e}")
+            self.close()
             self.recognizer = None
             self.microphone = None
+            self.source = None
             
-    def listen(self, timeout=None, phrase_timeout=None):
-        """Listen for audio input and convert to text"""
-        if not self.recognizer or not self.microphone:
-            return None
+    def calibrate(self):
+        """Calibrate for ambient noise, blocking for CALIBRATION_SECONDS"""
+        print("🎤 Calibrating microphone for background noise... (speak normally)")
+        with self.source as source:
+            self.recognizer.adjust_for_ambient_noise(source, duration=Config.CALIBRATION_SECONDS)
+        self.apply_calibration(self.recognizer.energy_threshold)
+        self.save_calibration()
+        print("✅ Microphone calibration complete!")
+            
+    def apply_calibration(self, energy_threshold):
+        """Use energy_threshold for phrase detection and derive the VAD noise floor from it"""
+        self.recognizer.energy_threshold = energy_threshold
+        if self.vad:
+            self.vad.calibrate(energy_threshold / self.recognizer.dynamic_energy_ratio)
             
+    def load_calibration(self):
+        """Apply a saved calibration if it exists and is fresh enough; returns True if applied"""
         try:
-            with self.microphone as source:
-                # Listen with better settings
-                audio = self.recognizer.listen(
-                    source, 
-                    timeout=timeout, 
-                    phrase_time_limit=phrase_timeout
-                )
-                
-            # Try multiple recognition methods for better accuracy
-            text = None
+            with open(Config.CALIBRATION_FILE, 'r') as f:
+                saved = json.load(f)
+            if time.time() - saved['timestamp'] > Config.CALIBRATION_MAX_AGE:
+                return False
+            self.apply_calibration(float(saved['energy_threshold']))
+            if self.vad and saved.get('noise_floor'):
+                self.vad.calibrate(float(saved['noise_floor']))
+            return True
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
             
-            # Method 1: Google (most accurate)
-            try:
-                text = self.recognizer.recognize_google(audio, language='en-US')
-                if text:
-                    return text.strip()
-            except (sr.UnknownValueError, sr.RequestError):
-                pass
+    def save_calibration(self):
+        """Persist the current energy threshold and noise floor"""
+        calibration = {
+            'energy_threshold': self.recognizer.energy_threshold,
+            'noise_floor': self.vad.noise_floor if self.vad else None,
+            'timestamp': time.time()
+        }
+        try:
+            with open(Config.CALIBRATION_FILE, 'w') as f:
+                json.dump(calibration, f, indent=2)
+        except OSError as e:
+            self.logger.error(f"Error saving microphone calibration: {e}")
             
-            # Method 2: Try with different language settings
+    def recalibrate_in_background(self):
+        """Recalibrate from a copy of the live audio while the saved threshold stays in use"""
+        capture = self.capture
+        chunks = []
+        needed = int(Config.CALIBRATION_SECONDS * capture.SAMPLE_RATE / capture.CHUNK)
+        done = threading.Event()
+        
+        def collect(chunk):
+            chunks.append(chunk)
+            if len(chunks) >= needed:
+                done.set()
+        
+        def recalibrate():
+            capture.add_tap(collect)
             try:
-                text = self.recognizer.recognize_google(audio, language='en-IN')  # Indian English
-                if text:
-                    return text.strip()
-            except (sr.UnknownValueError, sr.RequestError):
-                pass
+                if not done.wait(Config.CALIBRATION_SECONDS * 5):
+                    return
+            finally:
+                capture.remove_tap(collect)
+            
+            # Run the stock algorithm on a scratch recognizer, then swap the result in
+            scratch = sr.Recognizer()
+            scratch.energy_threshold = self.recognizer.energy_threshold
+            scratch.dynamic_energy_ratio = self.recognizer.dynamic_energy_ratio
+            source = ChunkListSource(chunks, capture.SAMPLE_RATE, capture.SAMPLE_WIDTH, capture.CHUNK)
+            scratch.adjust_for_ambient_noise(source, duration=Config.CALIBRATION_SECONDS)
+            self.apply_calibration(scratch.energy_threshold)
+            self.save_calibration()
+            self.logger.info(f"Background recalibration done, energy threshold {scratch.energy_threshold:.1f}")
+        
+        threading.Thread(target=recalibrate, name="MicRecalibration", daemon=True).start()
+            
+    def flush_audio(self):
+        """Drop audio buffered so far, e.g. JARVIS's own speech"""
+        if self.capture:
+            self.capture.flush()
+            
+    def close(self):
+        """Release the long-lived input stream and the recognition threads"""
+        if getattr(self, 'wake_spotter', None):
+            self.wake_spotter.log_stats()
+        if self.capture:
+            self.capture.close()
+            self.capture = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+            
+    def recognize(self, audio, backend=None):
+        """Recognize audio in every configured locale at once.
+        
+        Returns the first result at or above min_confidence, otherwise the most
+        confident result that arrived before the deadline.
+        """
+        backend = backend or self.backend
+        locales = self.locales if backend.multilingual else self.locales[:1]
+        futures = [self.executor.submit(backend.recognize, audio, locale) for locale in locales]
+        best = None
+        try:
+            for future in as_completed(futures, timeout=self.deadline):
+                try:
+                    result = future.result()
+                except (sr.UnknownValueError, sr.RequestError) as e:
+                    self.logger.debug(f"Recognition failed for one locale: {e}")
+                    continue
+                if not result or not result[0]:
+                    continue
+                if result[1] >= self.min_confidence:
+                    return result[0]
+                if best is None or result[1] > best[1]:
+                    best = result
+        except TimeoutError:
+            self.logger.debug("Recognition deadline reached")
+        return best[0] if best else None
             
+    def wake_energy_threshold(self):
+        """Energy a clip needs to reach the wake spotter; the VAD noise floor adapts, energy_threshold does not"""
+        if self.vad and self.vad.noise_floor is not None:
+            return self.vad.noise_floor * self.vad.energy_ratio
+        return self.recognizer.energy_threshold
+
+    def listen(self, timeout=None, phrase_timeout=None, wake=False):
+        """Listen for audio input and convert to text; wake=True uses the wake-word backend"""
+        if not self.recognizer or not self.source:
             return None
+        if self.capture and self.capture.exhausted:
+            # A dead capture would return b"" forever; raise so the caller's recovery runs
+            raise RuntimeError(f"Audio capture stopped: {self.capture.error or 'end of stream'}")
+            
+        try:
+            # Entering a StreamingAudioSource is free; the stream stays open between calls
+            with self.source as source:
+                if self.vad and self.capture:
+                    # VAD end-pointing stops after a short silence instead of the fixed pause_threshold
+                    audio = self.vad.listen(source, timeout=timeout, phrase_time_limit=phrase_timeout)
+                else:
+                    # Listen with better settings
+                    audio = self.recognizer.listen(
+                        source, 
+                        timeout=timeout, 
+                        phrase_time_limit=phrase_timeout
+                    )
+                
+            if self.vad:
+                # Noise-only clips never reach recognition; speech is sent without its silences
+                audio = self.vad.trim(audio)
+                if audio is None:
+                    return None
+                
+            if wake:
+                if self.wake_spotter and not self.wake_spotter.is_likely(audio, self.wake_energy_threshold()):
+                    return None
+                return self.recognize(audio, self.wake_backend)
+            return self.recognize(audio, self.backend)
             
         except sr.UnknownValueError:
             return None
@@ -1,43 +1,255 @@
-import pyttsx3
+import itertools
+import queue
+import re
 import threading
+import time
+from collections import deque
+import pyttsx3
 from config.config import Config
+from core.tts_cache import TTSCache, WavPlayer
+from utils.helpers import split_sentences
 from utils.logger import get_logger
 
+PRIORITY_HIGH = 0      # Acknowledgments and errors jump the queue
+PRIORITY_NORMAL = 1
+_RENDER = 50           # Pre-rendering fixed phrases only runs when nothing is waiting to be spoken
+_STOP = 99             # Shutdown sentinel sorts after everything already queued
+
+class Utterance:
+    """Handle for queued speech; wait on done or cancel it"""
+
+    def __init__(self, text, priority):
+        self.text = text
+        self.priority = priority
+        self.cancelled = False
+        self.done = threading.Event()
+        self.queued_at = time.perf_counter()
+        self.first_audio_at = None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
 class TextToSpeech:
     def __init__(self):
-        self.engine = pyttsx3.init()
         self.logger = get_logger(__name__)
         self.lock = threading.Lock()
-        
-        # Configure voice settings
-        self.setup_voice()
-        
+        self.queue = queue.PriorityQueue()
+        self.counter = itertools.count()
+        self.current = None
+        self.last_spoken = None    # (utterance, monotonic end time) for echo checks after playback
+        self.engine = None
+        self.cache = TTSCache() if Config.TTS_CACHE_ENABLED else None
+        self.player = None
+        self.first_audio_latencies = deque(maxlen=100)
+        self.listeners = []
+
+        # pyttsx3 engines must stay on one thread, so the worker creates and owns it
+        ready = threading.Event()
+        self.worker = threading.Thread(target=self._run, args=(ready,), name="TextToSpeech", daemon=True)
+        self.worker.start()
+        ready.wait(timeout=10)
+
     def setup_voice(self):
         """Configure TTS voice properties"""
         try:
             voices = self.engine.getProperty('voices')
-            
+
             # Try to set a male voice (for JARVIS feel)
             for voice in voices:
                 if 'male' in voice.name.lower() or 'david' in voice.name.lower():
                     self.engine.setProperty('voice', voice.id)
                     break
-                    
+
             # Set rate and volume
             self.engine.setProperty('rate', Config.TTS_RATE)
             self.engine.setProperty('volume', Config.TTS_VOLUME)
         except Exception as e:
             self.logger.error(f"Error setting up voice: {e}")
-        
-    def speak(self, text):
-        """Convert text to speech"""
-        if not text:
-            return
-            
-        with self.lock:
+
+    def _run(self, ready):
+        try:
+            self.engine = pyttsx3.init()
+            self.setup_voice()
+            self.engine.connect('started-utterance', self._on_audio_started)
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            self.logger.error(f"Error initializing text-to-speech: {e}")
+        finally:
+            ready.set()
+
+        # Opened once here, off the acknowledgment path, and only ever used by this thread
+        if self.cache:
+            self.player = WavPlayer()
+
+        while True:
+            priority, _, utterance = self.queue.get()
+            if priority == _STOP:
+                if self.player:
+                    self.player.close()
+                break
+            if priority == _RENDER:
+                self._render(utterance.text)
+                continue
+            if utterance.cancelled or self.engine is None:
+                utterance.done.set()
+                continue
+
+            with self.lock:
+                self.current = utterance
             try:
-                self.logger.debug(f"Speaking: {text}")
-                self.engine.say(text)
-                self.engine.runAndWait()
+                self.logger.debug(f"Speaking: {utterance.text}")
+                if not self._play_cached(utterance):
+                    self._speak_streaming(utterance)
             except Exception as e:
-                self.logger.error(f"Error in text-to-speech: {e}")
\ No newline at end of file
+                self.logger.error(f"Error in text-to-speech: {e}")
+            finally:
+                with self.lock:
+                    self.current = None
+                    self.last_spoken = (utterance, time.monotonic())
+                # Listeners run before waiters wake, so e.g. a flush cannot eat audio recorded after wait()
+                for callback in self.listeners:
+                    try:
+                        callback(utterance)
+                    except Exception as e:
+                        self.logger.error(f"Error in text-to-speech listener: {e}")
+                utterance.done.set()
+
+    def add_listener(self, callback):
+        """Register a callback run on the worker with each utterance once it finishes playing"""
+        self.listeners.append(callback)
+
+    def _speak_streaming(self, utterance):
+        """Queue each sentence separately so the first one plays while the rest are synthesized"""
+        for chunk in split_sentences(utterance.text, Config.TTS_CHUNK_CHARS):
+            self.engine.say(chunk)
+        self.engine.runAndWait()
+
+    def _on_audio_started(self, name=None):
+        with self.lock:
+            utterance = self.current
+        if utterance and utterance.cancelled:
+            self.engine.stop()
+        elif utterance and utterance.first_audio_at is None:
+            self._record_first_audio(utterance)
+
+    def _on_word(self, name=None, location=None, length=None):
+        # Engine callbacks run on the worker, the only thread allowed to call engine.stop()
+        with self.lock:
+            utterance = self.current
+        if utterance and utterance.cancelled:
+            self.engine.stop()
+
+    def _record_first_audio(self, utterance):
+        utterance.first_audio_at = time.perf_counter()
+        latency = utterance.first_audio_at - utterance.queued_at
+        self.first_audio_latencies.append(latency)
+        self.logger.debug(f"Time to first audio: {latency * 1000:.0f} ms")
+
+    def time_to_first_audio(self):
+        """Latest and average seconds from speak() to the first audible chunk"""
+        latencies = list(self.first_audio_latencies)
+        if not latencies:
+            return {'last': None, 'average': None, 'samples': 0}
+        return {
+            'last': latencies[-1],
+            'average': sum(latencies) / len(latencies),
+            'samples': len(latencies)
+        }
+
+    def _voice_key(self):
+        """Engine settings that change how a phrase sounds"""
+        return (
+            self.engine.getProperty('voice'),
+            self.engine.getProperty('rate'),
+            self.engine.getProperty('volume')
+        )
+
+    def _play_cached(self, utterance):
+        """Play a pre-rendered file for the utterance if one exists"""
+        if not self.cache or not self.player or not self.player.available:
+            return False
+        path = self.cache.lookup(utterance.text, *self._voice_key())
+        if not path:
+            return False
+        self._record_first_audio(utterance)
+        return self.player.play(path, should_stop=lambda: utterance.cancelled)
+
+    def _render(self, text):
+        """Synthesize text to the cache directory (worker thread only)"""
+        if self.engine is None or self.cache.lookup(text, *self._voice_key()):
+            return
+        path = self.cache.path_for(text, *self._voice_key())
+        try:
+            self.engine.save_to_file(text, str(path))
+            self.engine.runAndWait()
+            self.cache.store(path)
+        except Exception as e:
+            self.logger.error(f"Error pre-rendering speech: {e}")
+
+    def register_phrases(self, phrases):
+        """Pre-render fixed phrases in the background so they later play straight from disk"""
+        if not self.cache:
+            return
+        for text in phrases:
+            if text:
+                self.queue.put((_RENDER, next(self.counter), Utterance(text, _RENDER)))
+
+    def speak(self, text, priority=PRIORITY_NORMAL, wait=False):
+        """Queue text for speech and return its Utterance; wait=True blocks until spoken"""
+        if not text:
+            return None
+
+        utterance = Utterance(text, priority)
+        self.queue.put((priority, next(self.counter), utterance))
+        if wait:
+            utterance.wait()
+        return utterance
+
+    def cancel(self, utterance):
+        """Cancel one utterance; if it is playing, the worker stops it at the next word"""
+        utterance.cancel()
+
+    def interrupt(self):
+        """Barge-in: drop everything queued and stop the current utterance"""
+        kept = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] in (_RENDER, _STOP):
+                kept.append(item)  # Background renders and shutdown survive a barge-in
+                continue
+            item[2].cancel()
+            item[2].done.set()
+        for item in kept:
+            self.queue.put(item)
+
+        with self.lock:
+            current = self.current
+        if current:
+            self.cancel(current)
+
+    def is_speaking(self):
+        with self.lock:
+            return self.current is not None
+
+    def is_echo(self, heard):
+        """True if heard text is just our own speech picked up by the microphone"""
+        if not heard:
+            return False
+        # The transcript arrives after end-pointing and recognition, usually once playback is over
+        with self.lock:
+            spoken = [self.current] if self.current else []
+            if self.last_spoken and time.monotonic() - self.last_spoken[1] <= Config.TTS_ECHO_WINDOW:
+                spoken.append(self.last_spoken[0])
+        heard_words = set(re.findall(r"\w+", heard.lower()))
+        return any(heard_words <= set(re.findall(r"\w+", utterance.text.lower())) for utterance in spoken)
+
+    def shutdown(self, timeout=None):
+        """Finish queued speech, then stop the worker"""
+        self.queue.put((_STOP, next(self.counter), None))
+        self.worker.join(timeout)
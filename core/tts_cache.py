@@ -0,0 +1,136 @@
+import hashlib
+import os
+import threading
+import wave
+from pathlib import Path
+from config.config import Config
+from utils.logger import get_logger
+
+class TTSCache:
+    """Size-bounded LRU directory of pre-rendered speech, keyed by (text, voice, rate, volume)"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.logger = get_logger(__name__)
+        self.directory = Path(directory or Config.TTS_CACHE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes or Config.TTS_CACHE_MAX_BYTES
+        self.lock = threading.Lock()
+
+        # path -> size; file mtimes carry the recency order across restarts
+        self.sizes = {path: path.stat().st_size for path in self.directory.glob("*.wav")}
+
+    def path_for(self, text, voice, rate, volume):
+        key = hashlib.sha1(f"{text}|{voice}|{rate}|{volume}".encode('utf-8')).hexdigest()
+        return self.directory / f"{key}.wav"
+
+    def lookup(self, text, voice, rate, volume):
+        """Path of the cached rendering, or None; a hit marks it most recently used"""
+        path = self.path_for(text, voice, rate, volume)
+        with self.lock:
+            if path not in self.sizes:
+                return None
+        try:
+            os.utime(path)
+        except OSError:
+            with self.lock:
+                self.sizes.pop(path, None)
+            return None
+        return path
+
+    def store(self, path):
+        """Register a freshly rendered file, dropping it if it is not a readable WAV"""
+        try:
+            with wave.open(str(path), 'rb') as wav:
+                if wav.getnframes() == 0:
+                    raise ValueError("empty rendering")
+        except (wave.Error, EOFError, ValueError, OSError) as e:
+            self.logger.debug(f"Not caching {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return False
+
+        with self.lock:
+            self.sizes[path] = path.stat().st_size
+        self.evict()
+        return True
+
+    def evict(self):
+        """Remove least recently used files until the cache fits in max_bytes"""
+        with self.lock:
+            total = sum(self.sizes.values())
+            if total <= self.max_bytes:
+                return
+            by_age = sorted(self.sizes, key=lambda p: p.stat().st_mtime if p.exists() else 0)
+            for path in by_age:
+                if total <= self.max_bytes:
+                    break
+                total -= self.sizes.pop(path)
+                path.unlink(missing_ok=True)
+
+class WavPlayer:
+    """Plays WAV files through one PyAudio instance and output stream kept open between plays.
+
+    Creating a PyAudio instance enumerates every audio device, which would cost
+    more than a short cached phrase takes to play; use it from a single thread.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.audio = None
+        self.stream = None
+        self.stream_format = None
+        self.available = True
+        try:
+            import pyaudio
+            self.audio = pyaudio.PyAudio()
+        except Exception as e:
+            self.logger.debug(f"Cached speech playback unavailable: {e}")
+            self.available = False
+
+    def _stream_for(self, width, channels, rate):
+        stream_format = (width, channels, rate)
+        if self.stream is not None and self.stream_format == stream_format:
+            return self.stream
+        self._close_stream()
+        self.stream = self.audio.open(
+            format=self.audio.get_format_from_width(width),
+            channels=channels,
+            rate=rate,
+            output=True
+        )
+        self.stream_format = stream_format
+        return self.stream
+
+    def play(self, path, should_stop=lambda: False, chunk_size=1024):
+        """Play a WAV file; returns False if playback is unavailable or fails"""
+        if not self.available:
+            return False
+        try:
+            with wave.open(str(path), 'rb') as wav:
+                stream = self._stream_for(wav.getsampwidth(), wav.getnchannels(), wav.getframerate())
+                data = wav.readframes(chunk_size)
+                while data and not should_stop():
+                    stream.write(data)
+                    data = wav.readframes(chunk_size)
+            return True
+        except Exception as e:
+            self.logger.debug(f"Error playing cached speech: {e}")
+            self._close_stream()
+            return False
+
+    def _close_stream(self):
+        if self.stream is not None:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception:
+                pass
+        self.stream = None
+        self.stream_format = None
+
+    def close(self):
+        """Release the output stream and PyAudio"""
+        self._close_stream()
+        if self.audio is not None:
+            self.audio.terminate()
+            self.audio = None
+        self.available = False
@@ -0,0 +1,104 @@
+from collections import deque
+import numpy as np
+import speech_recognition as sr
+from config.config import Config
+from utils.logger import get_logger
+
+FRAME_SECONDS = 0.02
+
+class VoiceActivityDetector:
+    """Frame-level speech/non-speech classifier using energy and spectral flatness.
+
+    A frame counts as speech when its RMS energy clears the adaptive noise floor
+    by VAD_ENERGY_RATIO and its spectrum is peaky (flatness below VAD_FLATNESS_MAX);
+    broadband noise has a flat spectrum even when it is loud.
+    """
+
+    def __init__(self, noise_floor=None):
+        self.logger = get_logger(__name__)
+        self.noise_floor = noise_floor
+        self.energy_ratio = Config.VAD_ENERGY_RATIO
+        self.flatness_max = Config.VAD_FLATNESS_MAX
+        self.end_silence = Config.VAD_END_SILENCE
+        self.padding = Config.VAD_PADDING
+        self.min_speech = Config.VAD_MIN_SPEECH
+        self.dropped_clips = 0
+
+    def calibrate(self, noise_floor):
+        """Seed the noise floor, e.g. from the ambient-noise energy threshold"""
+        self.noise_floor = noise_floor
+
+    def is_speech(self, samples):
+        """Classify one frame of int16 samples"""
+        if len(samples) == 0:
+            return False
+        energy = float(np.sqrt(np.mean(samples ** 2)))
+        if self.noise_floor is None:
+            self.noise_floor = energy
+            return False
+
+        spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples)))) + 1e-10
+        flatness = float(np.exp(np.mean(np.log(spectrum))) / np.mean(spectrum))
+
+        speech = energy > self.noise_floor * self.energy_ratio and flatness < self.flatness_max
+        if not speech:
+            # Track slow changes in background noise
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * energy
+        return speech
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        """Record one phrase from a streaming source, ending after end_silence of non-speech"""
+        if source.SAMPLE_WIDTH != 2:
+            raise ValueError("VAD end-pointing needs 16-bit audio")
+        seconds_per_chunk = source.CHUNK / source.SAMPLE_RATE
+        pre_roll = deque(maxlen=int(self.padding / seconds_per_chunk) + 1)
+        frames = []
+        waited = 0.0
+        phrase_length = 0.0
+        silence = 0.0
+
+        while True:
+            chunk = source.stream.read(source.CHUNK)
+            if not chunk:
+                break
+            speech = self.is_speech(np.frombuffer(chunk, dtype='<i2').astype(np.float64))
+
+            if not frames:
+                waited += seconds_per_chunk
+                pre_roll.append(chunk)
+                if speech:
+                    frames = list(pre_roll)
+                elif timeout and waited > timeout:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                continue
+
+            frames.append(chunk)
+            phrase_length += seconds_per_chunk
+            silence = 0.0 if speech else silence + seconds_per_chunk
+            if silence >= self.end_silence:
+                break
+            if phrase_time_limit and phrase_length >= phrase_time_limit:
+                break
+
+        if not frames:
+            raise sr.WaitTimeoutError("audio stream ended before a phrase started")
+        return sr.AudioData(b"".join(frames), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def trim(self, audio):
+        """Cut leading/trailing non-speech from an AudioData; None if it holds too little speech"""
+        raw = audio.get_raw_data(convert_width=2)
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float64)
+        frame_size = max(1, int(audio.sample_rate * FRAME_SECONDS))
+        flags = [
+            self.is_speech(samples[start:start + frame_size])
+            for start in range(0, len(samples) - frame_size + 1, frame_size)
+        ]
+
+        if sum(flags) * FRAME_SECONDS < self.min_speech:
+            self.dropped_clips += 1
+            return None
+
+        pad = int(self.padding / FRAME_SECONDS)
+        first = max(0, flags.index(True) - pad)
+        last = min(len(flags), len(flags) - flags[::-1].index(True) + pad)
+        return sr.AudioData(raw[first * frame_size * 2:last * frame_size * 2], audio.sample_rate, 2)
@@ -0,0 +1,160 @@
+import argparse
+import re
+import time
+from collections import deque
+from difflib import SequenceMatcher
+from config.config import Config
+
+SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+def soundex(word):
+    """Four character Soundex key, e.g. jarvis/jervis/jarvus -> J612"""
+    word = re.sub(r"[^a-z]", "", word.lower())
+    if not word:
+        return ""
+    key = word[0].upper()
+    previous = SOUNDEX_CODES.get(word[0], "")
+    for char in word[1:]:
+        code = SOUNDEX_CODES.get(char, "")
+        if code and code != previous:
+            key += code
+        if char not in "hw":
+            previous = code
+    return (key + "000")[:4]
+
+class AhoCorasick:
+    """Finds every occurrence of a fixed set of phrases in one pass over the text"""
+
+    def __init__(self, phrases):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [set()]
+        for phrase in phrases:
+            self._insert(phrase)
+        self._build_failure_links()
+
+    def _insert(self, phrase):
+        node = 0
+        for char in phrase:
+            if char not in self.goto[node]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(set())
+                self.goto[node][char] = len(self.goto) - 1
+            node = self.goto[node][char]
+        self.output[node].add(phrase)
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] |= self.output[self.fail[child]]
+
+    def search(self, text):
+        """Return the longest phrase found in text, or None"""
+        node = 0
+        found = None
+        for char in text:
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for phrase in self.output[node]:
+                if found is None or len(phrase) > len(found):
+                    found = phrase
+        return found
+
+class WakeWordMatcher:
+    """Wake-word detection built once: exact variants via Aho-Corasick, mishears via Soundex"""
+
+    def __init__(self, wake_words, min_confidence=None):
+        self.wake_words = [word.lower() for word in wake_words]
+        self.min_confidence = min_confidence or Config.WAKE_WORD_MIN_CONFIDENCE
+        self.automaton = AhoCorasick(self.wake_words)
+
+        # Soundex key -> canonical single-word wake words sharing it
+        self.phonetic_index = {}
+        for wake_word in self.wake_words:
+            for word in wake_word.split():
+                if word in ("hey", "ok", "hello"):
+                    continue
+                self.phonetic_index.setdefault(soundex(word), set()).add(word)
+
+    def match(self, text):
+        """Return (wake_word, confidence 0-100) for the best match in text, or (None, 0)"""
+        text = text.strip().lower()
+        if not text:
+            return None, 0
+
+        exact = self.automaton.search(text)
+        if exact:
+            return exact, 100
+
+        # Single tokens and adjacent pairs, so "jar vis" is heard as "jarvis"
+        tokens = re.findall(r"[a-z]+", text)
+        candidates = tokens + [a + b for a, b in zip(tokens, tokens[1:])]
+
+        best = (None, 0)
+        for candidate in candidates:
+            for wake_word in self.phonetic_index.get(soundex(candidate), ()):
+                confidence = round(100 * SequenceMatcher(None, candidate, wake_word).ratio())
+                if confidence > best[1]:
+                    best = (wake_word, confidence)
+
+        if best[1] >= self.min_confidence:
+            return best
+        return None, best[1]
+
+    def is_wake_word(self, text):
+        return self.match(text)[0] is not None
+
+def legacy_is_wake_word(wake_words, text):
+    """The previous per-call substring + fuzzywuzzy loop, kept for benchmarking"""
+    from fuzzywuzzy import fuzz
+    text = text.strip().lower()
+    if any(wake_word in text for wake_word in wake_words):
+        return True
+    return any(fuzz.partial_ratio(wake_word, text) >= 65 for wake_word in wake_words)
+
+def benchmark(corpus_path, wake_words, repeat=20):
+    """Time legacy vs. precomputed matching over a transcript corpus and report disagreements"""
+    with open(corpus_path, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+
+    matcher = WakeWordMatcher(wake_words)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        legacy = [legacy_is_wake_word(wake_words, line) for line in lines]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        current = [matcher.match(line) for line in lines]
+    current_time = time.perf_counter() - start
+
+    calls = repeat * len(lines)
+    print(f"{len(lines)} transcripts x {repeat} runs")
+    print(f"legacy:  {legacy_time / calls * 1e6:8.1f} us/transcript")
+    print(f"matcher: {current_time / calls * 1e6:8.1f} us/transcript")
+    for line, old, (wake_word, confidence) in zip(lines, legacy, current):
+        if old != (wake_word is not None):
+            print(f"  differs: {line!r} legacy={old} matcher={wake_word} ({confidence})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark wake-word matching")
+    parser.add_argument("corpus", nargs="?", default=str(Config.DATA_DIR / "wake_word_corpus.txt"))
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    benchmark(args.corpus, Config.WAKE_WORDS, args.repeat)
@@ -0,0 +1,239 @@
+import argparse
+import wave
+from pathlib import Path
+import numpy as np
+from config.config import Config
+from utils.logger import get_logger
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 400      # 25 ms at 16 kHz
+FRAME_STEP = 160        # 10 ms at 16 kHz
+FFT_SIZE = 512
+NUM_FILTERS = 26
+NUM_COEFFS = 13
+
+def _mel_filterbank():
+    """Triangular mel filters over the FFT bins"""
+    def to_mel(hz):
+        return 2595 * np.log10(1 + hz / 700.0)
+
+    def to_hz(mel):
+        return 700 * (10 ** (mel / 2595.0) - 1)
+
+    mel_points = np.linspace(to_mel(0), to_mel(SAMPLE_RATE / 2), NUM_FILTERS + 2)
+    bins = np.floor((FFT_SIZE + 1) * to_hz(mel_points) / SAMPLE_RATE).astype(int)
+    bank = np.zeros((NUM_FILTERS, FFT_SIZE // 2 + 1))
+    for i in range(1, NUM_FILTERS + 1):
+        left, center, right = bins[i - 1], bins[i], bins[i + 1]
+        if center > left:
+            bank[i - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[i - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return bank
+
+def _dct_matrix():
+    """DCT-II basis keeping the first NUM_COEFFS cepstral coefficients"""
+    n = np.arange(NUM_FILTERS)
+    k = np.arange(NUM_COEFFS)[:, None]
+    return np.cos(np.pi * k * (2 * n + 1) / (2 * NUM_FILTERS))
+
+MEL_FILTERBANK = _mel_filterbank()
+DCT_MATRIX = _dct_matrix()
+WINDOW = np.hamming(FRAME_LENGTH)
+
+def pcm_to_samples(raw_data):
+    """16-bit little-endian mono PCM bytes to a float array"""
+    return np.frombuffer(raw_data, dtype='<i2').astype(np.float64)
+
+def rms(samples):
+    """Root-mean-square energy in the same units as Recognizer.energy_threshold"""
+    return float(np.sqrt(np.mean(samples ** 2))) if len(samples) else 0.0
+
+def cepstra(samples):
+    """MFCC frames (frames x NUM_COEFFS) for 16 kHz samples, before mean normalization"""
+    if len(samples) < FRAME_LENGTH:
+        samples = np.pad(samples, (0, FRAME_LENGTH - len(samples)))
+    emphasized = np.append(samples[0], samples[1:] - 0.97 * samples[:-1])
+
+    num_frames = 1 + (len(emphasized) - FRAME_LENGTH) // FRAME_STEP
+    indices = np.arange(FRAME_LENGTH)[None, :] + FRAME_STEP * np.arange(num_frames)[:, None]
+    frames = emphasized[indices] * WINDOW
+
+    power = np.abs(np.fft.rfft(frames, FFT_SIZE)) ** 2 / FFT_SIZE
+    energies = np.log(power @ MEL_FILTERBANK.T + 1e-10)
+    return energies @ DCT_MATRIX.T
+
+def mfcc(samples):
+    """Mean-normalized MFCC frames for a clip that holds just the wake word (a template)"""
+    coeffs = cepstra(samples)
+    return coeffs - coeffs.mean(axis=0)
+
+def sliding_cmn(coeffs, window):
+    """Subtract a centered moving mean of window frames from each frame.
+
+    A whole-clip mean is skewed by whatever else the clip contains, so the
+    wake word inside a longer phrase would no longer look like a template
+    normalized over the word alone.
+    """
+    n = len(coeffs)
+    totals = np.vstack([np.zeros(coeffs.shape[1]), np.cumsum(coeffs, axis=0)])
+    low = np.clip(np.arange(n) - window // 2, 0, n)
+    high = np.clip(np.arange(n) + window - window // 2, 0, n)
+    return coeffs - (totals[high] - totals[low]) / (high - low)[:, None]
+
+def subsequence_dtw(template, query):
+    """Average cosine distance of the best alignment of template anywhere inside query.
+
+    Uses the (1,1), (1,2), (2,1) step pattern so each query column only depends
+    on the two previous columns and can be computed with vector operations.
+    """
+    t = template / (np.linalg.norm(template, axis=1, keepdims=True) + 1e-10)
+    q = query / (np.linalg.norm(query, axis=1, keepdims=True) + 1e-10)
+    cost = 1.0 - t @ q.T    # template frames x query frames
+
+    m, n = cost.shape
+    inf = np.full(m, np.inf)
+    prev2, prev1 = inf.copy(), inf.copy()
+    best = np.inf
+    for j in range(n):
+        current = np.full(m, np.inf)
+        current[0] = cost[0, j]     # Free start anywhere in the query
+        diagonal = prev1[:-1]
+        skip_template = np.concatenate(([np.inf], prev1[:-2])) if m > 2 else np.full(m - 1, np.inf)
+        skip_query = prev2[:-1]
+        current[1:] = cost[1:, j] + np.minimum(np.minimum(diagonal, skip_template), skip_query)
+        best = min(best, current[-1])
+        prev2, prev1 = prev1, current
+    return best / m
+
+class WakeWordSpotter:
+    """Cheap keyword spotting on raw audio so full ASR only runs when "jarvis" is likely"""
+
+    def __init__(self, templates=None, threshold=None):
+        self.logger = get_logger(__name__)
+        self.templates = list(templates or [])
+        self.threshold = threshold or Config.WAKE_SPOTTER_THRESHOLD
+        self.checked = 0
+        self.passed = 0
+
+    @classmethod
+    def from_directory(cls, directory=None):
+        """Load every WAV recording of the wake word in directory as a template"""
+        directory = Path(directory or Config.WAKE_TEMPLATES_DIR)
+        templates = []
+        for path in sorted(directory.glob("*.wav")):
+            try:
+                with wave.open(str(path), 'rb') as wav:
+                    if wav.getframerate() != SAMPLE_RATE or wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                        raise ValueError("expected 16 kHz 16-bit mono")
+                    templates.append(mfcc(pcm_to_samples(wav.readframes(wav.getnframes()))))
+            except Exception as e:
+                get_logger(__name__).warning(f"Skipping wake word template {path.name}: {e}")
+        if not templates:
+            get_logger(__name__).warning(
+                f"No wake word templates in {directory}; only the energy gate runs before recognition. "
+                "Record some with: python -m core.wake_word_spotter enroll"
+            )
+        return cls(templates)
+
+    def enroll(self, audio, directory=None):
+        """Add an sr.AudioData recording of the wake word as a template and save it"""
+        directory = Path(directory or Config.WAKE_TEMPLATES_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"template_{len(self.templates) + 1:02d}.wav"
+        with open(path, 'wb') as f:
+            f.write(audio.get_wav_data(convert_rate=SAMPLE_RATE, convert_width=2))
+        self.templates.append(mfcc(pcm_to_samples(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))))
+        return path
+
+    def score(self, samples):
+        """Best template distance for the samples (lower is closer)"""
+        coeffs = cepstra(samples)
+        return min(subsequence_dtw(template, sliding_cmn(coeffs, len(template))) for template in self.templates)
+
+    def is_likely(self, audio, energy_threshold=0):
+        """True when the sr.AudioData could contain the wake word and deserves full recognition"""
+        self.checked += 1
+        if self.checked % Config.WAKE_SPOTTER_STATS_EVERY == 0:
+            self.log_stats()
+        samples = pcm_to_samples(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+
+        # Energy gate: quiet clips never reach recognition
+        if rms(samples) < energy_threshold:
+            return False
+
+        # Without enrolled templates only the energy gate applies
+        if self.templates and self.score(samples) > self.threshold:
+            return False
+
+        self.passed += 1
+        return True
+
+    def log_stats(self):
+        """Log how many clips the spotter kept away from full recognition"""
+        stats = self.stats()
+        if stats['checked']:
+            self.logger.info(
+                f"Wake spotter: {stats['skipped']}/{stats['checked']} clips skipped recognition "
+                f"({100 * stats['skipped'] / stats['checked']:.0f}%), {len(self.templates)} templates"
+            )
+
+    def stats(self):
+        """How many clips were checked and how many were passed on to ASR"""
+        return {'checked': self.checked, 'passed': self.passed, 'skipped': self.checked - self.passed}
+
+def enroll_from_microphone(spotter, count):
+    """Record count utterances of the wake word and save each as a template"""
+    import speech_recognition as sr
+    from core.vad import VoiceActivityDetector
+
+    recognizer = sr.Recognizer()
+    vad = VoiceActivityDetector()
+    with sr.Microphone(sample_rate=SAMPLE_RATE) as source:
+        print("Calibrating for background noise, stay quiet...")
+        recognizer.adjust_for_ambient_noise(source, duration=1)
+        vad.calibrate(recognizer.energy_threshold / recognizer.dynamic_energy_ratio)
+        for number in range(1, count + 1):
+            input(f"[{number}/{count}] Press Enter, then say \"Jarvis\" once...")
+            audio = recognizer.listen(source, timeout=5, phrase_time_limit=2)
+            # Templates should hold just the word, without the silence around it
+            audio = vad.trim(audio) or audio
+            print(f"Saved {spotter.enroll(audio)}")
+
+def enroll_from_files(spotter, paths):
+    """Save WAV recordings of the wake word (any rate, mono or stereo) as templates"""
+    import speech_recognition as sr
+
+    for path in paths:
+        with sr.AudioFile(str(path)) as source:
+            audio = sr.Recognizer().record(source)
+        print(f"Saved {spotter.enroll(audio)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage wake word templates for the keyword spotter")
+    commands = parser.add_subparsers(dest="command", required=True)
+    enroll_parser = commands.add_parser("enroll", help="Record or import recordings of the wake word")
+    enroll_parser.add_argument("wavs", nargs="*", help="WAV files to import instead of recording")
+    enroll_parser.add_argument("--count", type=int, default=5, help="Recordings to make from the microphone")
+    score_parser = commands.add_parser("score", help="Show the template distance of WAV files")
+    score_parser.add_argument("wavs", nargs="+")
+    args = parser.parse_args()
+
+    spotter = WakeWordSpotter.from_directory()
+    if args.command == "enroll":
+        if args.wavs:
+            enroll_from_files(spotter, args.wavs)
+        else:
+            enroll_from_microphone(spotter, args.count)
+        print(f"{len(spotter.templates)} templates in {Config.WAKE_TEMPLATES_DIR}")
+    else:
+        import speech_recognition as sr
+        if not spotter.templates:
+            parser.error("no templates yet; run: python -m core.wake_word_spotter enroll")
+        for path in args.wavs:
+            with sr.AudioFile(path) as source:
+                audio = sr.Recognizer().record(source)
+            samples = pcm_to_samples(audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2))
+            distance = spotter.score(samples)
+            verdict = "match" if distance <= spotter.threshold else "no match"
+            print(f"{path}: {distance:.3f} ({verdict}, threshold {spotter.threshold})")
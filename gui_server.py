@@ -5,12 +5,18 @@ import threading
 import webbrowser
 import time
 import os
+from collections import deque
+from datetime import datetime
+from config.config import Config
 
 class SimpleJarvisGUI:
     def __init__(self):
         self.app = Flask(__name__)
         self.socketio = SocketIO(self.app, cors_allowed_origins="*")
         self.jarvis_instance = None
+        self.last_status = {}
+        self.status_pusher_started = False
+        self.recent_events = deque(maxlen=Config.GUI_SNAPSHOT_EVENTS)  # Replayed to clients on connect
         self.setup_routes()
         
     def setup_routes(self):
@@ -26,12 +32,13 @@ class SimpleJarvisGUI:
         @self.socketio.on('connect')
         def handle_connect():
             print("🔌 GUI client connected")
-            emit('jarvis_update', {'type': 'SYSTEM', 'message': 'Connected to JARVIS backend'})
             
-            # Send current status
-            if self.jarvis_instance:
-                status = self.jarvis_instance.get_system_status()
-                emit('system_status', status)
+            # Recent activity and the last pushed status in one event; nothing is recomputed per client
+            greeting = self.make_event('SYSTEM', 'Connected to JARVIS backend')
+            emit('snapshot', {
+                'events': list(self.recent_events) + [greeting],
+                'status': self.last_status
+            })
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
@@ -68,10 +75,9 @@ class SimpleJarvisGUI:
         
         @self.socketio.on('get_status')
         def handle_status():
-            if self.jarvis_instance:
-                status = self.jarvis_instance.get_system_status()
-                emit('system_status', status)
-                emit('jarvis_update', {'type': 'SYSTEM', 'message': 'System status updated'})
+            # Status is pushed by the server; answer polls from the cached copy
+            if self.last_status:
+                emit('system_status', self.last_status)
         
         @self.socketio.on('send_command')
         def handle_text_command(data):
@@ -554,6 +560,7 @@ class SimpleJarvisGUI:
         Wake Words: "Hey JARVIS", "JARVIS", "OK JARVIS"
     </div>
 
+    <script src="https://cdn.socket.io/4.7.5/socket.io.min.js"></script>
     <script>
         // Global variables
         let isListening = true;
@@ -623,16 +630,18 @@ class SimpleJarvisGUI:
             }, 10);
         }
         
-        // Update system stats
-        function updateSystemStats() {
-            // Simulate system stats (in real implementation, get from Python backend)
-            const cpuUsage = Math.floor(Math.random() * 30) + 10;
-            const memoryUsage = Math.floor(Math.random() * 40) + 20;
-            
-            document.getElementById('cpu-usage').textContent = cpuUsage + '%';
-            document.getElementById('memory-usage').textContent = memoryUsage + '%';
-            
-            // Update uptime
+        // Apply system_status deltas pushed by the backend
+        function applySystemStatus(status) {
+            if (status.cpu !== undefined) {
+                document.getElementById('cpu-usage').textContent = status.cpu;
+            }
+            if (status.memory !== undefined) {
+                document.getElementById('memory-usage').textContent = status.memory;
+            }
+        }
+        
+        // Uptime ticks locally so it never needs a server round trip
+        function updateUptime() {
             const uptime = new Date() - startTime;
             const hours = Math.floor(uptime / 3600000);
             const minutes = Math.floor((uptime % 3600000) / 60000);
@@ -732,8 +741,20 @@ Available Commands:
             setTimeout(() => updateStatus('LISTENING FOR WAKE WORD...', true), 3000);
             setTimeout(() => addLogEntry('SYSTEM', 'All systems operational'), 3500);
             
-            // Start periodic updates
-            setInterval(updateSystemStats, 1000);
+            // CPU/memory arrive as pushed system_status events; only uptime ticks here
+            if (typeof io !== 'undefined') {
+                const socket = io();
+                socket.on('snapshot', (snapshot) => {
+                    snapshot.events.forEach((entry) => addLogEntry(entry.type, entry.message));
+                    applySystemStatus(snapshot.status);
+                });
+                socket.on('system_status', applySystemStatus);
+                socket.on('jarvis_update', (entry) => addLogEntry(entry.type, entry.message));
+                socket.on('jarvis_updates', (entries) => {
+                    entries.forEach((entry) => addLogEntry(entry.type, entry.message));
+                });
+            }
+            setInterval(updateUptime, 1000);
             
             // Start simulated activity
             setTimeout(simulateActivity, 10000);
@@ -769,6 +790,8 @@ Available Commands:
     
     def start_gui(self, jarvis_instance=None):
         self.jarvis_instance = jarvis_instance
+        if jarvis_instance is not None and hasattr(jarvis_instance, 'activity_logs'):
+            self.recent_events.extend(jarvis_instance.activity_logs)
         
         # Start server in background
         def run_server():
@@ -776,6 +799,7 @@ Available Commands:
         
         server_thread = threading.Thread(target=run_server, daemon=True)
         server_thread.start()
+        self.start_status_pusher()
         
         # Wait and open browser
         time.sleep(2)
@@ -788,10 +812,62 @@ Available Commands:
         
         return self.socketio
     
+    def start_status_pusher(self):
+        """Push system_status deltas to all clients on the server's own schedule"""
+        if self.status_pusher_started:
+            return
+        self.status_pusher_started = True
+        self.socketio.start_background_task(self._push_status_loop)
+    
+    def _push_status_loop(self):
+        while True:
+            # Push first so last_status is ready for the first client to connect
+            if self.jarvis_instance:
+                try:
+                    delta = self.status_delta(self.jarvis_instance.get_system_status())
+                    if delta:
+                        self.last_status.update(delta)
+                        # One broadcast for every connected client
+                        self.socketio.emit('system_status', delta)
+                except Exception as e:
+                    print(f"Status push failed: {e}")
+            self.socketio.sleep(Config.GUI_STATUS_PUSH_INTERVAL)
+    
+    def status_delta(self, status):
+        """Fields of status that moved past the threshold since the last push"""
+        delta = {}
+        for key, value in status.items():
+            if key == 'uptime':
+                continue  # Clients tick uptime locally
+            old = self.last_status.get(key)
+            try:
+                if abs(float(str(value).rstrip('%')) - float(str(old).rstrip('%'))) < Config.GUI_STATUS_DELTA_THRESHOLD:
+                    continue
+            except (TypeError, ValueError):
+                if value == old:
+                    continue
+            delta[key] = value
+        if delta and 'uptime' in status:
+            delta['uptime'] = status['uptime']
+        return delta
+    
+    def make_event(self, update_type, message):
+        return {'timestamp': datetime.now().strftime('%H:%M:%S'), 'type': update_type, 'message': message}
+    
     def send_update(self, update_type, message):
         """Send update to GUI"""
+        event = self.make_event(update_type, message)
+        self.recent_events.append(event)
         try:
-            self.socketio.emit('jarvis_update', {'type': update_type, 'message': message})
+            self.socketio.emit('jarvis_update', event)
+        except:
+            pass  # GUI might not be connected
+    
+    def send_updates(self, entries):
+        """Send a batch of activity entries to the GUI as one event"""
+        self.recent_events.extend(entries)
+        try:
+            self.socketio.emit('jarvis_updates', entries)
         except:
             pass  # GUI might not be connected
 
@@ -1270,6 +1346,7 @@ HTML_CONTENT = '''<!DOCTYPE html>
         Wake Words: "Hey JARVIS", "JARVIS", "OK JARVIS"
     </div>
 
+    <script src="https://cdn.socket.io/4.7.5/socket.io.min.js"></script>
     <script>
         // Global variables
         let isListening = true;
@@ -1339,16 +1416,18 @@ HTML_CONTENT = '''<!DOCTYPE html>
             }, 10);
         }
         
-        // Update system stats
-        function updateSystemStats() {
-            // Simulate system stats (in real implementation, get from Python backend)
-            const cpuUsage = Math.floor(Math.random() * 30) + 10;
-            const memoryUsage = Math.floor(Math.random() * 40) + 20;
-            
-            document.getElementById('cpu-usage').textContent = cpuUsage + '%';
-            document.getElementById('memory-usage').textContent = memoryUsage + '%';
-            
-            // Update uptime
+        // Apply system_status deltas pushed by the backend
+        function applySystemStatus(status) {
+            if (status.cpu !== undefined) {
+                document.getElementById('cpu-usage').textContent = status.cpu;
+            }
+            if (status.memory !== undefined) {
+                document.getElementById('memory-usage').textContent = status.memory;
+            }
+        }
+        
+        // Uptime ticks locally so it never needs a server round trip
+        function updateUptime() {
             const uptime = new Date() - startTime;
             const hours = Math.floor(uptime / 3600000);
             const minutes = Math.floor((uptime % 3600000) / 60000);
@@ -1448,8 +1527,20 @@ Available Commands:
             setTimeout(() => updateStatus('LISTENING FOR WAKE WORD...', true), 3000);
             setTimeout(() => addLogEntry('SYSTEM', 'All systems operational'), 3500);
             
-            // Start periodic updates
-            setInterval(updateSystemStats, 1000);
+            // CPU/memory arrive as pushed system_status events; only uptime ticks here
+            if (typeof io !== 'undefined') {
+                const socket = io();
+                socket.on('snapshot', (snapshot) => {
+                    snapshot.events.forEach((entry) => addLogEntry(entry.type, entry.message));
+                    applySystemStatus(snapshot.status);
+                });
+                socket.on('system_status', applySystemStatus);
+                socket.on('jarvis_update', (entry) => addLogEntry(entry.type, entry.message));
+                socket.on('jarvis_updates', (entries) => {
+                    entries.forEach((entry) => addLogEntry(entry.type, entry.message));
+                });
+            }
+            setInterval(updateUptime, 1000);
             
             // Start simulated activity
             setTimeout(simulateActivity, 10000);
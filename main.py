@@ -1,8 +1,10 @@
 import os
+import queue
 import sys
 import threading
 import time
 import traceback
+from collections import deque
 from datetime import datetime
 
 # Add current directory to Python path
@@ -13,9 +15,10 @@ sys.path.insert(0, current_dir)
 try:
     from config.config import Config
     from core.speech_recognition import SpeechRecognizer
-    from core.text_to_speech import TextToSpeech
+    from core.text_to_speech import TextToSpeech, PRIORITY_HIGH
     from core.nlp_processor import NLPProcessor
     from core.conversation_memory import ConversationMemory
+    from core.wake_word_matcher import WakeWordMatcher
     from utils.logger import setup_logger
 except ImportError as e:
     print(f"Import Error: {e}")
@@ -52,11 +55,14 @@ class JarvisAssistant:
             print("Setting up text-to-speech...")
             self.tts = TextToSpeech()
             
+            # The microphone keeps recording while JARVIS talks; drop that audio after every utterance
+            self.tts.add_listener(lambda utterance: self.speech_recognizer.flush_audio())
+            
             print("Setting up natural language processor...")
             self.nlp_processor = NLPProcessor()
             
             print("Setting up conversation memory...")
-            self.memory = ConversationMemory()
+            self.memory = ConversationMemory(max_history=Config.MAX_CONVERSATION_HISTORY)
             
             # Assistant state
             self.running = False
@@ -65,15 +71,31 @@ class JarvisAssistant:
             
             # GUI integration attributes
             self.gui_socket = None
-            self.activity_logs = []
+            self.activity_logs = deque(maxlen=Config.ACTIVITY_LOG_SIZE)
+            self.activity_queue = queue.Queue()
+            self.activity_emitter = threading.Thread(target=self._emit_activity_loop, name="ActivityEmitter", daemon=True)
+            self.activity_emitter.start()
             self.start_time = datetime.now()
             
-            # Enhanced wake words with common mishears
-            self.wake_words = [
-                "jarvis", "hey jarvis", "ok jarvis", "hello jarvis",
-                "java", "hey java", "ok java",      # Common mishears
-                "jervis", "jarrius", "jarvus"       # Phonetic variations
+            # Fixed phrases are rendered once and then played straight from the TTS cache
+            self.greeting = "Hello! JARVIS is now online and ready to assist you. Say 'Hey Jarvis' to activate me."
+            self.quick_responses = [
+                "Yes?", "I'm listening!", "How can I help?", 
+                "Ready!", "What can I do for you?", "I'm here!"
             ]
+            self.timeout_msg = "I didn't hear a command. Please try again."
+            self.fallback_msg = "I'm sorry, I couldn't process that command."
+            self.error_response = "Sorry, I encountered an error processing your command."
+            self.goodbye = "Goodbye! JARVIS is going offline."
+            self.tts.register_phrases(
+                [self.greeting, self.timeout_msg, self.fallback_msg, self.error_response, self.goodbye]
+                + self.quick_responses
+                + self.nlp_processor.entertainment.jokes
+            )
+            
+            # Enhanced wake words with common mishears, matched by a prebuilt automaton
+            self.wake_words = list(Config.WAKE_WORDS)
+            self.wake_matcher = WakeWordMatcher(self.wake_words)
             
             print("JARVIS initialization complete!")
             self.logger.info("JARVIS initialized successfully")
@@ -84,7 +106,7 @@ class JarvisAssistant:
             sys.exit(1)
     
     def log_activity(self, activity_type, message):
-        """Log activity for GUI display"""
+        """Log activity for GUI display; only queues the entry, the emitter thread does the I/O"""
         timestamp = datetime.now().strftime('%H:%M:%S')
         log_entry = {
             'timestamp': timestamp,
@@ -93,20 +115,46 @@ class JarvisAssistant:
         }
         
         self.activity_logs.append(log_entry)
-        
-        # Keep only last 100 logs
-        if len(self.activity_logs) > 100:
-            self.activity_logs = self.activity_logs[-100:]
-        
-        # Update GUI if available
-        if GUI_AVAILABLE and hasattr(self, 'gui_socket') and self.gui_socket:
-            try:
-                gui.send_update(activity_type, message)
-            except:
-                pass  # GUI might not be connected
-        
-        # Also log to console
-        self.logger.info(f"[{activity_type}] {message}")
+        self.activity_queue.put(log_entry)
+    
+    def _emit_activity_loop(self):
+        """Send queued activity to the GUI and logger, one batch per burst"""
+        while True:
+            entry = self.activity_queue.get()
+            if entry is None:
+                break
+            
+            # Coalesce whatever else arrives within the batch window
+            batch = [entry]
+            deadline = time.monotonic() + Config.ACTIVITY_BATCH_WINDOW
+            stop = False
+            while len(batch) < Config.ACTIVITY_LOG_SIZE:
+                try:
+                    entry = self.activity_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            
+            for entry in batch:
+                self.logger.info(f"[{entry['type']}] {entry['message']}")
+            
+            # Update GUI if available
+            if GUI_AVAILABLE and self.gui_socket:
+                try:
+                    gui.send_updates(batch)
+                except Exception:
+                    pass  # GUI might not be connected
+            
+            if stop:
+                break
+    
+    def stop_activity_emitter(self, timeout=None):
+        """Deliver queued activity, then stop the emitter thread"""
+        self.activity_queue.put(None)
+        self.activity_emitter.join(timeout)
     
     def start_with_gui(self):
         """Start JARVIS with GUI - NEW METHOD"""
@@ -135,7 +183,7 @@ class JarvisAssistant:
         self.running = True
         
         # Initial greeting
-        greeting = "Hello! JARVIS is now online and ready to assist you. Say 'Hey Jarvis' to activate me."
+        greeting = self.greeting
         print(f"JARVIS: {greeting}")
         self.tts.speak(greeting)
         self.logger.info("JARVIS started successfully")
@@ -167,9 +215,11 @@ class JarvisAssistant:
             try:
                 # Listen for wake word
                 print("🎤 Listening...", end=" ", flush=True)
-                audio_text = self.speech_recognizer.listen(timeout=0.5)
+                audio_text = self.speech_recognizer.listen(timeout=0.5, wake=True)
                 
-                if audio_text:
+                if audio_text and self.tts.is_echo(audio_text):
+                    print("(Ignoring our own speech)")
+                elif audio_text:
                     print(f"Heard: '{audio_text}'")
                     
                     if self.is_wake_word(audio_text.lower()):
@@ -193,6 +243,7 @@ class JarvisAssistant:
                         print("🔄 Too many failures. Reinitializing speech recognition...")
                         try:
                             # Reinitialize speech components
+                            self.speech_recognizer.close()
                             self.speech_recognizer = SpeechRecognizer()
                             consecutive_failures = 0
                             last_restart = current_time
@@ -210,33 +261,21 @@ class JarvisAssistant:
                     time.sleep(1)
     
     def is_wake_word(self, text):
-        """Enhanced wake word detection with fuzzy matching"""
+        """Wake word detection with exact and phonetic matching"""
         if not text:
             return False
         
-        text = text.strip().lower()
-        
-        # Direct matching first
-        for wake_word in self.wake_words:
-            if wake_word in text:
-                print(f"✅ Direct wake word match: '{wake_word}'")
-                self.logger.info(f"Wake word detected: {wake_word} in '{text}'")
-                return True
-        
-        # Fuzzy matching for speech recognition errors
-        try:
-            from fuzzywuzzy import fuzz
-            
-            for wake_word in self.wake_words:
-                ratio = fuzz.partial_ratio(wake_word, text)
-                if ratio >= 65:  # Lower threshold for better detection
-                    print(f"✅ Fuzzy wake word match: '{wake_word}' (confidence: {ratio}%)")
-                    self.logger.info(f"Fuzzy wake word detected: {wake_word} in '{text}' (confidence: {ratio}%)")
-                    return True
-        except ImportError:
-            pass  # Fuzzy matching not available
+        wake_word, confidence = self.wake_matcher.match(text)
+        if wake_word is None:
+            return False
         
-        return False
+        if confidence == 100:
+            print(f"✅ Direct wake word match: '{wake_word}'")
+            self.logger.info(f"Wake word detected: {wake_word} in '{text}'")
+        else:
+            print(f"✅ Phonetic wake word match: '{wake_word}' (confidence: {confidence}%)")
+            self.logger.info(f"Phonetic wake word detected: {wake_word} in '{text}' (confidence: {confidence}%)")
+        return True
     
     def handle_wake_word(self):
         """Enhanced wake word handling with GUI updates"""
@@ -247,15 +286,17 @@ class JarvisAssistant:
             self.log_activity('WAKE', 'Wake word detected - JARVIS activated')
             
             # Quick acknowledgment responses
-            quick_responses = [
-                "Yes?", "I'm listening!", "How can I help?", 
-                "Ready!", "What can I do for you?", "I'm here!"
-            ]
+            quick_responses = self.quick_responses
+            
+            # Barge-in: the wake word cuts off whatever JARVIS is still saying
+            self.tts.interrupt()
             
             import random
             acknowledgment = random.choice(quick_responses)
             print(f"JARVIS: {acknowledgment}")
-            self.tts.speak(acknowledgment)
+            
+            # The acknowledgment is short; wait for it (and the flush after it) before listening
+            self.tts.speak(acknowledgment, priority=PRIORITY_HIGH, wait=True)
             
             # Listen for command
             self.process_command()
@@ -298,13 +339,13 @@ class JarvisAssistant:
                     self.logger.info(f"Response: {response}")
                     self.log_activity('RESPONSE', f'JARVIS: {response}')
                 else:
-                    fallback = "I'm sorry, I couldn't process that command."
+                    fallback = self.fallback_msg
                     print(f"JARVIS: {fallback}")
                     self.tts.speak(fallback)
                     self.log_activity('RESPONSE', fallback)
                     
             else:
-                timeout_msg = "I didn't hear a command. Please try again."
+                timeout_msg = self.timeout_msg
                 print(f"JARVIS: {timeout_msg}")
                 self.tts.speak(timeout_msg)
                 self.log_activity('TIMEOUT', 'No command heard - timeout')
@@ -316,8 +357,8 @@ class JarvisAssistant:
             self.log_activity('ERROR', error_msg)
             
             # Inform user of error
-            error_response = "Sorry, I encountered an error processing your command."
-            self.tts.speak(error_response)
+            error_response = self.error_response
+            self.tts.speak(error_response, priority=PRIORITY_HIGH)
         
         finally:
             print("\nReturning to wake word detection...\n")
@@ -346,20 +387,28 @@ class JarvisAssistant:
             self.log_activity('ERROR', error_msg)
             return error_msg
     
+    def _first_audio_ms(self):
+        average = self.tts.time_to_first_audio()['average']
+        return 'N/A' if average is None else f"{average * 1000:.0f} ms"
+
     def get_system_status(self):
         """Get system status for GUI"""
         try:
-            import psutil
-            cpu = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
+            from modules.system_metrics import get_sampler
+            sampler = get_sampler()
+            snapshot = sampler.latest()
             
             uptime = datetime.now() - self.start_time
             uptime_str = str(uptime).split('.')[0]  # Remove microseconds
             
+            percent = lambda value: 'N/A' if value is None else f"{value:.1f}%"  # cpu is None before the first tick
             status = {
-                'cpu': f"{cpu:.1f}%",
-                'memory': f"{memory.percent:.1f}%",
+                'cpu': percent(snapshot['cpu']),
+                'memory': percent(snapshot['memory']),
+                'cpu_1m': percent(sampler.averages(60)['cpu']),
+                'cpu_5m': percent(sampler.averages(300)['cpu']),
                 'uptime': uptime_str,
+                'tts_first_audio_ms': self._first_audio_ms(),
                 'status': 'ACTIVE' if self.running else 'OFFLINE',
                 'listening': self.is_active
             }
@@ -382,12 +431,16 @@ class JarvisAssistant:
         self.is_active = False
         
         try:
-            goodbye = "Goodbye! JARVIS is going offline."
+            goodbye = self.goodbye
             print(f"JARVIS: {goodbye}")
-            self.tts.speak(goodbye)
+            self.tts.interrupt()
+            self.tts.speak(goodbye, wait=True)
+            self.tts.shutdown(timeout=5)
+            self.memory.close(timeout=5)
             
             self.logger.info("JARVIS shutdown completed")
             self.log_activity('SYSTEM', 'JARVIS shutdown completed')
+            self.stop_activity_emitter(timeout=2)
             print("✅ JARVIS has been shut down successfully.")
             
         except Exception as e:
@@ -1,29 +1,26 @@
 import os
-import psutil
 import subprocess
 import platform
 from datetime import datetime
+from modules.system_metrics import get_sampler
 from utils.logger import get_logger
 
 class SystemController:
     def __init__(self):
         self.logger = get_logger(__name__)
+        self.metrics = get_sampler()
         
     def get_system_info(self):
         """Get system information"""
         try:
-            # Get CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Read the latest background sample instead of blocking on psutil
+            snapshot = self.metrics.latest()
+            cpu_percent = snapshot['cpu']
+            memory_percent = snapshot['memory']
+            disk_percent = snapshot['disk']
             
-            # Get memory info
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            
-            # Get disk info
-            disk = psutil.disk_usage('/')
-            disk_percent = disk.percent
-            
-            info = f"System Status: CPU usage is {cpu_percent}%, "
+            cpu_text = "not measured yet" if cpu_percent is None else f"{cpu_percent}%"
+            info = f"System Status: CPU usage is {cpu_text}, "
             info += f"Memory usage is {memory_percent}%, "
             info += f"Disk usage is {disk_percent}%"
             
@@ -0,0 +1,86 @@
+import threading
+import time
+from collections import deque
+import psutil
+from config.config import Config
+from utils.logger import get_logger
+
+class SystemMetricsSampler:
+    """Samples CPU, memory and disk usage on a background thread"""
+
+    def __init__(self, interval=None, history_seconds=300):
+        self.logger = get_logger(__name__)
+        self.interval = interval or Config.METRICS_SAMPLE_INTERVAL
+        self.history = deque(maxlen=max(1, int(history_seconds / self.interval)))
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # First non-blocking cpu_percent call only primes psutil's counters
+        psutil.cpu_percent(interval=None)
+
+    def sample(self):
+        """Take one snapshot without blocking"""
+        snapshot = {
+            'timestamp': time.time(),
+            'cpu': psutil.cpu_percent(interval=None),
+            'memory': psutil.virtual_memory().percent,
+            'disk': psutil.disk_usage('/').percent
+        }
+        self.history.append(snapshot)
+        return snapshot
+
+    def start(self):
+        """Start the sampler thread if it is not already running"""
+        if self.thread and self.thread.is_alive():
+            return self
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="SystemMetricsSampler", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop the sampler thread"""
+        self.stop_event.set()
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.error(f"Error sampling system metrics: {e}")
+
+    def latest(self):
+        """Most recent snapshot; before the first tick cpu is None (unknown)"""
+        try:
+            return self.history[-1]
+        except IndexError:
+            # cpu_percent only means something one interval after priming; memory/disk are instant
+            return {
+                'timestamp': time.time(),
+                'cpu': None,
+                'memory': psutil.virtual_memory().percent,
+                'disk': psutil.disk_usage('/').percent
+            }
+
+    def averages(self, window_seconds):
+        """Average cpu/memory/disk over the last window_seconds of history; None if unknown"""
+        cutoff = time.time() - window_seconds
+        window = [s for s in list(self.history) if s['timestamp'] >= cutoff]
+        if not window:
+            window = [self.latest()]
+        averages = {}
+        for key in ('cpu', 'memory', 'disk'):
+            values = [s[key] for s in window if s[key] is not None]
+            averages[key] = sum(values) / len(values) if values else None
+        return averages
+
+_sampler = None
+_sampler_lock = threading.Lock()
+
+def get_sampler():
+    """Shared, already running sampler instance"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = SystemMetricsSampler().start()
+        return _sampler
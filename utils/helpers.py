@@ -15,10 +15,41 @@ def clean_text(text):
     
     return text.lower()
 
+def normalize_command(text):
+    """Normalize a command for matching and caching"""
+    if not text:
+        return ""
+    
+    # Unlike clean_text, only sentence punctuation is dropped, so "open c++" keeps its "++"
+    return ' '.join(text.split()).rstrip('.!?').strip().lower()
+
 def extract_parameters(command, pattern):
     """Extract parameters from command using pattern"""
     pattern_regex = pattern.replace("*", "(.+?)")
     match = re.search(pattern_regex, command, re.IGNORECASE)
     if match:
         return [group.strip() for group in match.groups()]
-    return []
\ No newline at end of file
+    return []
+
+def split_sentences(text, max_length=80):
+    """Split text into sentences, breaking long ones further at clause punctuation"""
+    if not text:
+        return []
+    
+    chunks = []
+    for sentence in re.split(r'(?<=[.!?])\s+', text.strip()):
+        if len(sentence) <= max_length:
+            chunks.append(sentence)
+            continue
+        
+        # Long sentence: break after commas, semicolons and colons
+        current = ""
+        for clause in re.split(r'(?<=[,;:])\s+', sentence):
+            if current and len(current) + len(clause) + 1 > max_length:
+                chunks.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}".strip()
+        if current:
+            chunks.append(current)
+    return [chunk for chunk in chunks if chunk]
@@ -1,23 +1,62 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
 from config.config import Config
 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage()
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
 def setup_logger():
     """Setup main logger for the application"""
+    global _listener
+
     # Ensure log directory exists
     os.makedirs(Config.LOGS_DIR, exist_ok=True)
-    
-    # Configure logging
-    logging.basicConfig(
-        level=getattr(logging, Config.LOG_LEVEL),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(Config.LOG_FILE),
-            logging.StreamHandler()
-        ]
-    )
+
+    if _listener is None:
+        file_handler = logging.handlers.RotatingFileHandler(
+            Config.LOG_FILE,
+            maxBytes=Config.LOG_MAX_BYTES,
+            backupCount=Config.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter() if Config.LOG_JSON else logging.Formatter(LOG_FORMAT))
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        # Callers only enqueue records; the listener thread does the disk and console I/O
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, Config.LOG_LEVEL))
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+        _listener.start()
+        atexit.register(_listener.stop)  # Flushes queued records on a clean exit
+
     return logging.getLogger('JARVIS')
 
 def get_logger(name):
     """Get logger for specific module"""
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)